@@ -0,0 +1,51 @@
+"""Shared session helpers for API routes."""
+from functools import wraps
+
+from flask import g, jsonify, session
+
+from db import db, User, UserRole
+
+_MISSING = object()
+
+
+def get_current_user_id():
+    """Get current user ID from session, decoded once per request."""
+    user_id = getattr(g, '_user_id', _MISSING)
+    if user_id is _MISSING:
+        user_id = g._user_id = session.get('user_id') or None
+    return user_id
+
+
+def current_user():
+    """Get the logged-in User, loaded at most once per request."""
+    user = getattr(g, '_user', _MISSING)
+    if user is _MISSING:
+        user_id = get_current_user_id()
+        user = g._user = db.session.get(User, user_id) if user_id else None
+    return user
+
+
+def current_role():
+    """
+    Get the logged-in user's role.
+
+    Read from the signed session (written at login), falling back to the
+    database for sessions created before the role was stored there.
+    """
+    if not get_current_user_id():
+        return None
+    role = session.get('role')
+    if role is None:
+        user = current_user()
+        role = user.role if user else None
+    return role
+
+
+def admin_required(f):
+    """Decorator to restrict a route to admin users."""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if current_role() != UserRole.ADMIN.value:
+            return jsonify({'error': 'Admin access required'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
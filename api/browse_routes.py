@@ -1,59 +1,167 @@
 """Browse API routes for sports, leagues, seasons, events, and markets."""
-from decimal import Decimal
-from typing import Dict, List
-from flask import Blueprint, request, jsonify, session
-from sqlalchemy import func
+from typing import Dict, Iterable, List, Optional, Tuple
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from api._auth import get_current_user_id
 from db import (
     db, Sport, League, Season, Event, Market, Asset, Position, Wallet, LedgerEntry,
-    EventResult, Participant
+    EventResult, Participant, Team, EventStatus, MarketStatus, TransactionType
 )
-from sqlalchemy.orm import joinedload
-from pricing.bonding_curve import price
+from sqlalchemy.orm import joinedload, load_only, raiseload
+from pricing.bonding_curve import prices_float
+from api.caching import etag, ttl_cache
+from api.json_provider import stream_json_array
 
 bp = Blueprint('browse', __name__, url_prefix='/api')
 
+# Case-insensitive ?status= / ?type= filter values, by enum member name
+_EVENT_STATUSES = {member.name: member for member in EventStatus}
+_MARKET_STATUSES = {member.name: member for member in MarketStatus}
+_TRANSACTION_TYPES = {member.name: member for member in TransactionType}
 
-def get_supplies_batch(market_ids: List[int]) -> Dict[int, Decimal]:
+# Sports/leagues/seasons change at most daily (via the seeding scripts).
+BROWSE_CACHE_TTL = 60
+
+
+def market_listing_options() -> list:
     """
-    Get current supply for multiple markets in a single query.
-    
-    Args:
-        market_ids: List of market IDs
-    
-    Returns:
-        Dict mapping market_id to supply (Decimal)
+    Loader options for market listing rows.
+
+    Eager-loads the asset (with participant/team) and event that
+    _serialize_market() reads, restricted to the serialized columns.
+    Anything else raises instead of lazy-loading.
     """
-    if not market_ids:
-        return {}
-    
-    supplies = db.session.query(
-        Position.market_id,
-        func.sum(Position.shares).label('total_supply')
-    ).filter(
-        Position.market_id.in_(market_ids)
-    ).group_by(Position.market_id).all()
-    
-    # Build dict with default of 0 for markets with no positions
-    supply_map = {market_id: Decimal('0') for market_id in market_ids}
-    for row in supplies:
-        supply_map[row.market_id] = Decimal(str(row.total_supply)) if row.total_supply else Decimal('0')
-    
-    return supply_map
+    asset = joinedload(Market.asset)
+    return [
+        load_only(
+            Market.id, Market.event_id, Market.asset_id, Market.status, Market.market_type,
+            Market.a, Market.b, Market.created_at, Market.updated_at, raiseload=True,
+        ),
+        asset.load_only(
+            Asset.id, Asset.asset_type, Asset.symbol, Asset.display_name,
+            Asset.participant_id, Asset.team_id, raiseload=True,
+        ),
+        asset.joinedload(Asset.participant).load_only(
+            Participant.id, Participant.name, Participant.short_code, raiseload=True,
+        ).raiseload('*'),
+        asset.joinedload(Asset.team).load_only(
+            Team.id, Team.name, Team.short_code, raiseload=True,
+        ).raiseload('*'),
+        joinedload(Market.event).load_only(
+            Event.id, Event.name, Event.venue, Event.start_at, Event.end_at, Event.status, raiseload=True,
+        ).raiseload('*'),
+        raiseload('*'),
+    ]
 
 
-def get_current_user_id():
-    """Get current user ID from session."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return None
-    return user_id
+def _enum_value(value):
+    """Return an enum's value, or the value itself as a string."""
+    return value.value if hasattr(value, 'value') else str(value)
+
+
+def _isoformat(value):
+    """Return an ISO-8601 string for a datetime, or None."""
+    return value.isoformat() if value else None
+
+
+def _serialize_asset(asset) -> Dict:
+    """Serialize an asset with its participant/team, if any."""
+    asset_data = {
+        'id': asset.id,
+        'type': _enum_value(asset.asset_type),
+        'symbol': asset.symbol,
+        'display_name': asset.display_name,
+    }
+    participant = asset.participant
+    if participant:
+        asset_data['participant'] = {
+            'id': participant.id,
+            'name': participant.name,
+            'short_code': participant.short_code,
+        }
+    team = asset.team
+    if team:
+        asset_data['team'] = {
+            'id': team.id,
+            'name': team.name,
+            'short_code': team.short_code,
+        }
+    return asset_data
+
+
+def _serialize_event(event) -> Dict:
+    """Serialize the event summary embedded in market listings."""
+    return {
+        'id': event.id,
+        'name': event.name,
+        'venue': event.venue,
+        'start_at': _isoformat(event.start_at),
+        'end_at': _isoformat(event.end_at),
+        'status': _enum_value(event.status),
+    }
+
+
+def _serialize_market(market: Market, current_supply: float, current_price: float) -> Dict:
+    """Serialize a market listing row with its asset and event."""
+    asset = market.asset
+    event = market.event
+    return {
+        'market_id': market.id,
+        'event_id': market.event_id,
+        'asset_id': market.asset_id,
+        'status': _enum_value(market.status),
+        'current_price': current_price,
+        'current_supply': current_supply,
+        'market_type': market.market_type,
+        'bonding_curve_a': float(market.a),
+        'bonding_curve_b': float(market.b),
+        'created_at': _isoformat(market.created_at),
+        'updated_at': _isoformat(market.updated_at),
+        'asset': _serialize_asset(asset) if asset else None,
+        'event': _serialize_event(event) if event else None,
+    }
+
+
+# Largest page a client can request with ``limit``
+PAGE_LIMIT_MAX = 500
+
+
+def _page_args() -> Tuple[Optional[int], Optional[int]]:
+    """
+    Read ``limit``/``after_id`` cursor pagination args from the request.
+
+    Without ``limit`` the listing is unbounded (``None``): the frontend doesn't
+    follow ``X-Next-Cursor`` yet, so capping it would silently truncate.
+    """
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, PAGE_LIMIT_MAX))
+    after_id = request.args.get('after_id', type=int)
+    return limit, after_id
+
+
+def _paged_response(items: List[Dict], id_key: str, limit: Optional[int]):
+    """JSON array response with the next cursor in ``X-Next-Cursor`` when the page is full."""
+    response = jsonify(items)
+    if len(items) == limit:
+        response.headers['X-Next-Cursor'] = str(items[-1][id_key])
+    return response
+
+
+def _streamed_page_response(items: Iterable[Dict], count: int, last_id, limit: Optional[int]):
+    """Streamed JSON array response; ``count``/``last_id`` describe the fetched page for the cursor."""
+    response = Response(stream_with_context(stream_json_array(items)), mimetype='application/json')
+    if count == limit:
+        response.headers['X-Next-Cursor'] = str(last_id)
+    return response
 
 
 @bp.route('/sports', methods=['GET'])
+@etag(max_age=BROWSE_CACHE_TTL)
+@ttl_cache(ttl=BROWSE_CACHE_TTL)
 def get_sports():
     """Get all sports."""
     try:
-        sports = Sport.query.all()
+        sports = Sport.query.options(load_only(Sport.id, Sport.code, Sport.name, raiseload=True)).all()
         return jsonify([
             {
                 'id': sport.id,
@@ -67,11 +175,13 @@ def get_sports():
 
 
 @bp.route('/leagues', methods=['GET'])
+@etag(max_age=BROWSE_CACHE_TTL)
+@ttl_cache(ttl=BROWSE_CACHE_TTL, key=('sport_id',))
 def get_leagues():
     """Get leagues, optionally filtered by sport_id."""
     try:
         sport_id = request.args.get('sport_id', type=int)
-        query = League.query
+        query = League.query.options(load_only(League.id, League.sport_id, League.name, raiseload=True))
         if sport_id:
             query = query.filter_by(sport_id=sport_id)
         
@@ -89,11 +199,15 @@ def get_leagues():
 
 
 @bp.route('/seasons', methods=['GET'])
+@etag(max_age=BROWSE_CACHE_TTL)
+@ttl_cache(ttl=BROWSE_CACHE_TTL, key=('league_id',))
 def get_seasons():
     """Get seasons, optionally filtered by league_id."""
     try:
         league_id = request.args.get('league_id', type=int)
-        query = Season.query
+        query = Season.query.options(
+            load_only(Season.id, Season.league_id, Season.year, Season.status, raiseload=True)
+        )
         if league_id:
             query = query.filter_by(league_id=league_id)
         
@@ -118,25 +232,33 @@ def get_events():
         sport_id = request.args.get('sport_id', type=int)
         season_id = request.args.get('season_id', type=int)
         status = request.args.get('status', type=str)
+        # metadata_json can be large and listings rarely need it: ?include=metadata
+        include_metadata = 'metadata' in request.args.get('include', '').split(',')
+        limit, after_id = _page_args()
         
-        query = Event.query
+        columns = [
+            Event.id, Event.season_id, Event.name, Event.venue,
+            Event.start_at, Event.end_at, Event.status,
+        ]
+        if include_metadata:
+            columns.append(Event.metadata_json)
+        query = Event.query.options(load_only(*columns, raiseload=True))
         if season_id:
             query = query.filter_by(season_id=season_id)
         elif sport_id:
-            # Filter by sport through season -> league -> sport
-            query = query.join(Season).join(League).filter(League.sport_id == sport_id)
+            query = query.filter(Event.sport_id == sport_id)
         
-        if status:
-            from db import EventStatus
-            try:
-                status_enum = EventStatus[status.upper()]
-                query = query.filter(Event.status == status_enum)
-            except (KeyError, AttributeError):
-                pass
+        status_enum = _EVENT_STATUSES.get(status.upper()) if status else None
+        if status_enum:
+            query = query.filter(Event.status == status_enum)
         
-        events = query.all()
-        return jsonify([
-            {
+        if after_id:
+            query = query.filter(Event.id > after_id)
+        events = query.order_by(Event.id).limit(limit).all()
+        
+        result = []
+        for event in events:
+            event_data = {
                 'id': event.id,
                 'season_id': event.season_id,
                 'name': event.name,
@@ -144,10 +266,12 @@ def get_events():
                 'start_at': event.start_at.isoformat() if event.start_at else None,
                 'end_at': event.end_at.isoformat() if event.end_at else None,
                 'status': event.status.value if hasattr(event.status, 'value') else str(event.status),
-                'metadata': event.metadata_json,
             }
-            for event in events
-        ]), 200
+            if include_metadata:
+                event_data['metadata'] = event.metadata_json
+            result.append(event_data)
+        
+        return _paged_response(result, 'id', limit), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -156,68 +280,20 @@ def get_events():
 def get_event_markets(event_id):
     """Get markets for an event."""
     try:
-        markets = Market.query.filter_by(event_id=event_id).options(
-            joinedload(Market.asset).joinedload(Asset.participant),
-            joinedload(Market.asset).joinedload(Asset.team),
-            joinedload(Market.event),
-        ).all()
+        rows = db.session.query(Market, Market.supply).filter(
+            Market.event_id == event_id
+        ).options(*market_listing_options()).all()
         
-        # Batch fetch supplies for all markets (single query instead of N queries)
-        market_ids = [m.id for m in markets]
-        supply_map = get_supplies_batch(market_ids)
-        
-        result = []
-        for market in markets:
-            current_supply = supply_map.get(market.id, Decimal('0'))
-            current_price = price(
-                current_supply,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
-            )
-            
-            asset_data = None
-            if market.asset:
-                asset_data = {
-                    'id': market.asset.id,
-                    'type': market.asset.type.value if hasattr(market.asset.type, 'value') else str(market.asset.type),
-                    'symbol': market.asset.symbol,
-                    'display_name': market.asset.display_name,
-                }
-                if market.asset.participant:
-                    asset_data['participant'] = {
-                        'id': market.asset.participant.id,
-                        'name': market.asset.participant.name,
-                        'short_code': market.asset.participant.short_code,
-                    }
-                if market.asset.team:
-                    asset_data['team'] = {
-                        'id': market.asset.team.id,
-                        'name': market.asset.team.name,
-                        'short_code': market.asset.team.short_code,
-                    }
-            
-            event_data = None
-            if market.event:
-                event_data = {
-                    'id': market.event.id,
-                    'name': market.event.name,
-                    'venue': market.event.venue,
-                    'start_at': market.event.start_at.isoformat() if market.event.start_at else None,
-                    'end_at': market.event.end_at.isoformat() if market.event.end_at else None,
-                    'status': market.event.status.value if hasattr(market.event.status, 'value') else str(market.event.status),
-                }
-            
-            result.append({
-                'market_id': market.id,
-                'event_id': market.event_id,
-                'asset_id': market.asset_id,
-                'status': market.status.value if hasattr(market.status, 'value') else str(market.status),
-                'current_price': float(current_price),
-                'current_supply': float(current_supply),
-                'market_type': market.market_type,
-                'asset': asset_data,
-                'event': event_data,
-            })
+        supplies = [float(supply) for _, supply in rows]
+        prices = prices_float(
+            supplies,
+            [float(market.a) for market, _ in rows],
+            [float(market.b) for market, _ in rows],
+        )
+        result = [
+            _serialize_market(market, current_supply, current_price)
+            for (market, _), current_supply, current_price in zip(rows, supplies, prices)
+        ]
         
         return jsonify(result), 200
     except Exception as e:
@@ -225,6 +301,7 @@ def get_event_markets(event_id):
 
 
 @bp.route('/events/<int:event_id>/results', methods=['GET'])
+@etag(max_age=BROWSE_CACHE_TTL)
 def get_event_results(event_id):
     """Get event results."""
     try:
@@ -259,91 +336,37 @@ def get_markets():
         event_id = request.args.get('event_id', type=int)
         sport_id = request.args.get('sport_id', type=int)
         status = request.args.get('status', type=str)
+        limit, after_id = _page_args()
         
-        query = Market.query.options(
-            joinedload(Market.asset).joinedload(Asset.participant),
-            joinedload(Market.asset).joinedload(Asset.team),
-            joinedload(Market.event),
-        )
+        query = db.session.query(Market, Market.supply).options(*market_listing_options())
         
         if event_id:
-            query = query.filter_by(event_id=event_id)
+            query = query.filter(Market.event_id == event_id)
         elif sport_id:
-            # Filter by sport through event -> season -> league -> sport
-            query = query.join(Event).join(Season).join(League).filter(League.sport_id == sport_id)
-        
-        if status:
-            from db import MarketStatus
-            try:
-                status_enum = MarketStatus[status.upper()]
-                query = query.filter(Market.status == status_enum)
-            except (KeyError, AttributeError):
-                pass
+            query = query.filter(Market.sport_id == sport_id)
         
-        markets = query.all()
+        status_enum = _MARKET_STATUSES.get(status.upper()) if status else None
+        if status_enum:
+            query = query.filter(Market.status == status_enum)
         
-        # Batch fetch supplies for all markets (single query instead of N queries)
-        market_ids = [m.id for m in markets]
-        supply_map = get_supplies_batch(market_ids)
+        if after_id:
+            query = query.filter(Market.id > after_id)
+        rows = query.order_by(Market.id).limit(limit).all()
         
-        result = []
-        for market in markets:
-            current_supply = supply_map.get(market.id, Decimal('0'))
-            current_price = price(
-                current_supply,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
-            )
-            
-            asset_data = None
-            if market.asset:
-                asset_data = {
-                    'id': market.asset.id,
-                    'type': market.asset.type.value if hasattr(market.asset.type, 'value') else str(market.asset.type),
-                    'symbol': market.asset.symbol,
-                    'display_name': market.asset.display_name,
-                }
-                if market.asset.participant:
-                    asset_data['participant'] = {
-                        'id': market.asset.participant.id,
-                        'name': market.asset.participant.name,
-                        'short_code': market.asset.participant.short_code,
-                    }
-                if market.asset.team:
-                    asset_data['team'] = {
-                        'id': market.asset.team.id,
-                        'name': market.asset.team.name,
-                        'short_code': market.asset.team.short_code,
-                    }
-            
-            event_data = None
-            if market.event:
-                event_data = {
-                    'id': market.event.id,
-                    'name': market.event.name,
-                    'venue': market.event.venue,
-                    'start_at': market.event.start_at.isoformat() if market.event.start_at else None,
-                    'end_at': market.event.end_at.isoformat() if market.event.end_at else None,
-                    'status': market.event.status.value if hasattr(market.event.status, 'value') else str(market.event.status),
-                }
-            
-            result.append({
-                'market_id': market.id,
-                'event_id': market.event_id,
-                'asset_id': market.asset_id,
-                'status': market.status.value if hasattr(market.status, 'value') else str(market.status),
-                'current_price': float(current_price),
-                'current_supply': float(current_supply),
-                'market_type': market.market_type,
-                'bonding_curve_a': float(market.a),
-                'bonding_curve_b': float(market.b),
-                'created_at': market.created_at.isoformat() if market.created_at else None,
-                'updated_at': market.updated_at.isoformat() if market.updated_at else None,
-                'asset': asset_data,
-                'event': event_data,
-            })
+        supplies = [float(supply) for _, supply in rows]
+        prices = prices_float(
+            supplies,
+            [float(market.a) for market, _ in rows],
+            [float(market.b) for market, _ in rows],
+        )
+        # Rows are serialized lazily as the response body is written
+        items = (
+            _serialize_market(market, current_supply, current_price)
+            for (market, _), current_supply, current_price in zip(rows, supplies, prices)
+        )
         
-        return jsonify(result), 200
+        last_id = rows[-1][0].id if rows else None
+        return _streamed_page_response(items, len(rows), last_id, limit), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -356,44 +379,52 @@ def get_portfolio():
         return jsonify({'error': 'Authentication required'}), 401
     
     try:
-        positions = Position.query.filter_by(user_id=user_id).options(
-            joinedload(Position.market)
-        ).all()
+        limit, after_id = _page_args()
+        # Positions with their market's curve parameters and supply in one statement;
+        # only the position columns the response serializes are selected
+        query = db.session.query(Position, Market.a, Market.b, Market.supply).join(
+            Market, Market.id == Position.market_id
+        ).filter(
+            Position.user_id == user_id
+        ).options(
+            load_only(
+                Position.id, Position.market_id, Position.shares, Position.avg_entry_price,
+                Position.realized_pnl, Position.last_marked_at, raiseload=True
+            ),
+            raiseload('*'),
+        )
+        if after_id:
+            query = query.filter(Position.id > after_id)
+        rows = query.order_by(Position.id).limit(limit).all()
         
-        # Batch fetch supplies for all markets (single query instead of N queries)
-        market_ids = [p.market_id for p in positions if p.market_id]
-        supply_map = get_supplies_batch(market_ids)
+        supplies = [float(supply) for _, _, _, supply in rows]
+        prices = prices_float(
+            supplies,
+            [float(a) for _, a, _, _ in rows],
+            [float(b) for _, _, b, _ in rows],
+        )
         
-        result = []
-        for position in positions:
-            market = position.market
-            if market:
-                current_supply = supply_map.get(market.id, Decimal('0'))
-                current_price = price(
-                    current_supply,
-                    Decimal(str(market.a)),
-                    Decimal(str(market.b))
-                )
-                shares = float(position.shares)
-                avg_entry = float(position.avg_entry_price)
-                unrealized_pnl = (float(current_price) - avg_entry) * shares
-            else:
-                current_price = None
-                unrealized_pnl = None
+        def serialize(position, current_price):
+            shares = float(position.shares)
+            avg_entry = float(position.avg_entry_price)
+            realized_pnl = float(position.realized_pnl)
+            unrealized_pnl = (current_price - avg_entry) * shares
             
-            result.append({
+            return {
                 'position_id': position.id,
                 'market_id': position.market_id,
-                'shares': float(position.shares),
-                'avg_entry_price': float(position.avg_entry_price),
-                'realized_pnl': float(position.realized_pnl),
-                'current_price': float(current_price) if current_price else None,
-                'unrealized_pnl': float(unrealized_pnl) if unrealized_pnl else None,
-                'total_pnl': float(position.realized_pnl + (unrealized_pnl or 0)),
+                'shares': shares,
+                'avg_entry_price': avg_entry,
+                'realized_pnl': realized_pnl,
+                'current_price': current_price if current_price else None,
+                'unrealized_pnl': unrealized_pnl if unrealized_pnl else None,
+                'total_pnl': realized_pnl + unrealized_pnl,
                 'last_marked_at': position.last_marked_at.isoformat() if position.last_marked_at else None,
-            })
+            }
         
-        return jsonify(result), 200
+        items = (serialize(position, current_price) for (position, _, _, _), current_price in zip(rows, prices))
+        last_id = rows[-1][0].id if rows else None
+        return _streamed_page_response(items, len(rows), last_id, limit), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -432,16 +463,10 @@ def get_ledger():
         limit = request.args.get('limit', default=100, type=int)
         transaction_type = request.args.get('type', type=str)
         
-        from services.wallet_service import WalletService
-        entries = WalletService.get_ledger_history(user_id, limit)
+        type_enum = _TRANSACTION_TYPES.get(transaction_type.upper()) if transaction_type else None
         
-        if transaction_type:
-            from db import TransactionType
-            try:
-                type_enum = TransactionType[transaction_type.upper()]
-                entries = [e for e in entries if e.transaction_type == type_enum]
-            except (KeyError, AttributeError):
-                pass
+        from services.wallet_service import WalletService
+        entries = WalletService.get_ledger_history(user_id, limit, type_enum)
         
         return jsonify([
             {
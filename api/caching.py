@@ -0,0 +1,118 @@
+"""Process-local response caching and HTTP validators for read-mostly endpoints."""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Callable, Hashable, Iterable, Optional, Tuple, Union
+
+from flask import Response, current_app, request
+
+DEFAULT_MAX_ENTRIES = 256
+
+
+def ttl_cache(
+    ttl: float,
+    key: Union[Iterable[str], Callable[[], Hashable], None] = None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> Callable:
+    """
+    Cache a view's successful responses for ``ttl`` seconds.
+
+    ``key`` is either the names of the query args the view reads or a callable
+    returning the cache key; any other args are ignored so clients cannot grow
+    the cache by varying them. With no ``key`` the request path alone is used.
+    Entries hold the already serialized body, so a hit skips both the DB query
+    and JSON encoding. Only 200 responses are cached, at most ``max_entries``
+    per view with the least recently used evicted first; expired entries are
+    dropped on lookup and insert. The cache is per worker process; the
+    decorated view gets a ``cache_clear()`` attribute for explicit invalidation.
+    """
+    if key is None:
+        make_key = lambda: request.path
+    elif callable(key):
+        make_key = key
+    else:
+        arg_names = tuple(key)
+        make_key = lambda: (request.path,) + tuple(request.args.get(name) for name in arg_names)
+
+    def decorator(view: Callable) -> Callable:
+        # key -> (expires_at, status, body, mimetype), oldest use first
+        cache: "OrderedDict[Hashable, Tuple[float, int, bytes, str]]" = OrderedDict()
+        lock = threading.Lock()
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            cache_key = make_key()
+            now = time.monotonic()
+
+            with lock:
+                entry = cache.get(cache_key)
+                if entry is not None:
+                    if entry[0] > now:
+                        cache.move_to_end(cache_key)
+                    else:
+                        del cache[cache_key]
+                        entry = None
+            if entry is not None:
+                _, status, body, mimetype = entry
+                return Response(body, status, mimetype=mimetype)
+
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200 and not response.is_streamed:
+                with lock:
+                    _evict_expired(cache, now)
+                    cache[cache_key] = (now + ttl, response.status_code, response.get_data(), response.mimetype)
+                    cache.move_to_end(cache_key)
+                    while len(cache) > max_entries:
+                        cache.popitem(last=False)
+            return response
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+    return decorator
+
+
+def _evict_expired(cache: "OrderedDict[Hashable, Tuple[float, int, bytes, str]]", now: float) -> None:
+    """Drop expired entries; callers hold the cache lock."""
+    expired = [cache_key for cache_key, entry in cache.items() if entry[0] <= now]
+    for cache_key in expired:
+        del cache[cache_key]
+
+
+def etag(max_age: int = 60) -> Callable:
+    """
+    Add an ETag and ``Cache-Control`` to a view's successful responses.
+
+    The ETag is a blake2b digest of the body; requests whose ``If-None-Match``
+    matches get an empty 304 instead of the JSON payload.
+    """
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+
+            response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+            response.headers['Cache-Control'] = f'public, max-age={max_age}'
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
+
+
+def cache_control(value: str) -> Callable:
+    """Set a fixed ``Cache-Control`` header on a view's successful responses."""
+    def decorator(view: Callable) -> Callable:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = current_app.make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.headers['Cache-Control'] = value
+            return response
+        return wrapper
+    return decorator
@@ -1,10 +1,31 @@
 """F1 API routes for standings and telemetry."""
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, jsonify, session, request, current_app
 from f1 import F1Service
+from api.caching import cache_control, ttl_cache
 from functools import wraps
 
 bp = Blueprint('f1', __name__, url_prefix='/api/f1')
 
+# Runs independent upstream API calls concurrently within a request
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='f1-api')
+UPSTREAM_TIMEOUT_SECONDS = 10
+
+# Seconds to reuse live-race responses across polling clients
+RACE_STATUS_CACHE_TTL = 10
+TELEMETRY_CACHE_TTL = 2
+
+
+def _submit(fn, *args, **kwargs):
+    """Run fn on the pool inside the current app's context (the API client reads app config)."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            return fn(*args, **kwargs)
+
+    return _POOL.submit(run)
+
 
 def require_auth(f):
     """Decorator to require authentication for F1 routes."""
@@ -17,9 +38,8 @@ def require_auth(f):
 
 
 def get_f1_service() -> F1Service:
-    """Get F1Service instance configured from app config."""
-    provider = current_app.config.get('F1_PROVIDER', 'sportmonks')
-    return F1Service(provider=provider)
+    """Get the app's shared F1Service instance."""
+    return current_app.extensions['f1_service']
 
 
 @bp.route('/standings', methods=['GET'])
@@ -30,8 +50,10 @@ def get_standings():
         service = get_f1_service()
         season = request.args.get('season', type=int)
         
-        driver_standings = service.get_driver_standings(season=season)
-        constructor_standings = service.get_constructor_standings(season=season)
+        driver_future = _submit(service.get_driver_standings, season=season)
+        constructor_future = _submit(service.get_constructor_standings, season=season)
+        driver_standings = driver_future.result(timeout=UPSTREAM_TIMEOUT_SECONDS)
+        constructor_standings = constructor_future.result(timeout=UPSTREAM_TIMEOUT_SECONDS)
         
         if driver_standings is None or constructor_standings is None:
             return jsonify({
@@ -53,6 +75,8 @@ def get_standings():
 
 @bp.route('/race-status', methods=['GET'])
 @require_auth
+@cache_control('private, max-age=10')
+@ttl_cache(ttl=RACE_STATUS_CACHE_TTL, key=lambda: 'f1:race_ongoing')
 def get_race_status():
     """Check if a race is currently ongoing."""
     try:
@@ -76,13 +100,20 @@ def get_race_status():
         return jsonify({'message': 'Server error occurred'}), 500
 
 
+def _telemetry_session_key():
+    """Session the telemetry request targets; ``session_key`` wins over the legacy ``race_id``."""
+    return request.args.get('session_key', type=int) or request.args.get('race_id', type=int)
+
+
 @bp.route('/telemetry', methods=['GET'])
 @require_auth
+@cache_control('private, max-age=2')
+@ttl_cache(ttl=TELEMETRY_CACHE_TTL, key=lambda: f'f1:tele:{_telemetry_session_key()}')
 def get_telemetry():
     """Get real-time telemetry data for ongoing race."""
     try:
         service = get_f1_service()
-        race_id = request.args.get('race_id', type=int) or request.args.get('session_key', type=int)
+        race_id = _telemetry_session_key()
         
         telemetry = service.get_telemetry(session_key=race_id)
         
@@ -123,8 +154,8 @@ def get_last_race():
             }), 404
         
         return jsonify({
-            'race_found': True,
             **last_race,
+            'race_found': True,
         }), 200
         
     except Exception as e:
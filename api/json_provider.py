@@ -0,0 +1,50 @@
+"""orjson-backed JSON provider for Flask responses."""
+import enum
+from decimal import Decimal
+from typing import Any, Iterable, Iterator
+
+import orjson
+from flask.json.provider import JSONProvider
+
+_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(obj: Any) -> Any:
+    """Serialize types orjson doesn't handle natively."""
+    if isinstance(obj, Decimal):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider that serializes with orjson instead of the stdlib json module."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize data as a JSON string (kwargs are ignored)."""
+        return orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        """Deserialize data from a JSON string or bytes."""
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any):
+        """Build a JSON response, writing orjson's bytes output directly."""
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=_default, option=_DUMPS_OPTIONS),
+            mimetype='application/json',
+        )
+
+
+def stream_json_array(items: Iterable[Any]) -> Iterator[bytes]:
+    """Yield a JSON array one serialized element at a time."""
+    yield b'['
+    first = True
+    for item in items:
+        if not first:
+            yield b','
+        first = False
+        yield orjson.dumps(item, default=_default, option=_DUMPS_OPTIONS)
+    yield b']'
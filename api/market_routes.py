@@ -1,23 +1,16 @@
 """Market API routes for buying and selling shares."""
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
+from api._auth import get_current_user_id
 from decimal import Decimal, InvalidOperation
 from services.market_service import (
     MarketService, MarketClosedError, InsufficientSharesError
 )
 from services.wallet_service import WalletService, InsufficientBalanceError
-from db import Market
+from db import db, Market
 
 bp = Blueprint('market', __name__, url_prefix='/api/markets')
 
 
-def get_current_user_id():
-    """Get current user ID from session."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return None
-    return user_id
-
-
 @bp.route('/<int:market_id>', methods=['GET'])
 def get_market(market_id):
     """Get market information including current price and supply."""
@@ -119,8 +112,7 @@ def get_price_history(market_id):
     """Get price history for a market."""
     try:
         # Verify market exists
-        market = Market.query.get(market_id)
-        if not market:
+        if not db.session.query(Market.id).filter_by(id=market_id).first():
             return jsonify({'error': 'Market not found'}), 404
         
         # Get limit from query params
@@ -128,7 +120,7 @@ def get_price_history(market_id):
         if limit > 1000:
             limit = 1000
         
-        price_history = market.price_history[:limit]
+        price_history = MarketService.get_recent_price_history(market_id, limit)
         
         return jsonify({
             'market_id': market_id,
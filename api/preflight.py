@@ -0,0 +1,48 @@
+"""WSGI middleware that answers CORS preflight requests before they reach Flask."""
+from typing import Iterable, Optional
+
+CORS_METHODS = 'GET, HEAD, POST, OPTIONS, PUT, PATCH, DELETE'
+PREFLIGHT_MAX_AGE = 600
+
+
+class PreflightMiddleware:
+    """
+    Respond to CORS preflights (OPTIONS + Access-Control-Request-Method) with 204.
+
+    Mirrors the flask-cors setup in app.py (credentials allowed, origin
+    reflected, requested headers allowed) without URL routing or the
+    flask-cors after_request hook. Preflights from origins that aren't
+    allowed fall through to the app unchanged.
+    """
+
+    def __init__(self, app, origins: Optional[Iterable[str]] = None):
+        """
+        Args:
+            app: WSGI application to wrap
+            origins: Allowed origins, or None to allow any origin
+        """
+        self.app = app
+        self.origins = frozenset(origins) if origins is not None else None
+
+    def __call__(self, environ, start_response):
+        if environ.get('REQUEST_METHOD') != 'OPTIONS' or 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' not in environ:
+            return self.app(environ, start_response)
+
+        origin = environ.get('HTTP_ORIGIN')
+        if not origin or (self.origins is not None and origin not in self.origins):
+            return self.app(environ, start_response)
+
+        headers = [
+            ('Access-Control-Allow-Origin', origin),
+            ('Access-Control-Allow-Credentials', 'true'),
+            ('Access-Control-Allow-Methods', CORS_METHODS),
+            ('Access-Control-Max-Age', str(PREFLIGHT_MAX_AGE)),
+            ('Vary', 'Origin'),
+            ('Content-Length', '0'),
+        ]
+        requested_headers = environ.get('HTTP_ACCESS_CONTROL_REQUEST_HEADERS')
+        if requested_headers:
+            headers.append(('Access-Control-Allow-Headers', requested_headers))
+
+        start_response('204 No Content', headers)
+        return [b'']
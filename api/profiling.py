@@ -0,0 +1,38 @@
+"""Opt-in request profiling for local performance work (enabled with PROFILE=1)."""
+import logging
+
+from flask import Flask, g, request
+from sqlalchemy import event
+from werkzeug.middleware.profiler import ProfilerMiddleware
+
+from db import db
+
+logger = logging.getLogger(__name__)
+
+
+def init_app(app: Flask) -> None:
+    """
+    Wrap the app in Werkzeug's cProfile middleware and log SQL counts per request.
+
+    Profiles print the top 30 functions per request, or are written to
+    PROFILE_DIR as .prof files when it is set. The per-request statement
+    count makes N+1 query patterns show up in the log.
+    """
+    app.wsgi_app = ProfilerMiddleware(
+        app.wsgi_app,
+        restrictions=[30],
+        profile_dir=app.config.get('PROFILE_DIR'),
+    )
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        if g:
+            g._query_count = g.get('_query_count', 0) + 1
+
+    @app.after_request
+    def log_query_count(response):
+        logger.info(f"{request.method} {request.path} - {g.get('_query_count', 0)} SQL statements")
+        return response
@@ -1,5 +1,5 @@
 """Application routes."""
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, abort, current_app, jsonify, request
 import os
 
 bp = Blueprint('main', __name__)
@@ -12,7 +12,17 @@ def health():
 
 @bp.route('/debug/routing', methods=['GET'])
 def debug_routing():
-    """Debug endpoint to check routing configuration."""
+    """Debug endpoint to check routing configuration (debug mode only)."""
+    if not current_app.debug:
+        abort(404)
+    
+    # The URL map is fixed once blueprints are registered; list it once
+    all_routes = current_app.extensions.get('_rules_cache')
+    if all_routes is None:
+        all_routes = current_app.extensions['_rules_cache'] = [
+            str(rule) for rule in current_app.url_map.iter_rules()
+        ]
+    
     import logging
     logger = logging.getLogger(__name__)
     logger.info(f"Debug routing endpoint called - PATH_INFO: {request.environ.get('PATH_INFO')}")
@@ -25,7 +35,7 @@ def debug_routing():
         'url': request.url,
         'base_url': request.base_url,
         'request_path': request.path,
-        'all_routes': [str(rule) for rule in request.app.url_map.iter_rules()],
+        'all_routes': all_routes,
     }), 200
 
 
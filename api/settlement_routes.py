@@ -1,38 +1,17 @@
 """Settlement API routes (admin only)."""
-from flask import Blueprint, request, jsonify, session
+from flask import Blueprint, request, jsonify
+from api._auth import admin_required
 from services.settlement_service import SettlementService
-from db import User, Event
+from sqlalchemy.orm import raiseload
+from db import db, Event
 
 bp = Blueprint('settlement', __name__, url_prefix='/api/events')
 
 
-def get_current_user_id():
-    """Get current user ID from session."""
-    user_id = session.get('user_id')
-    if not user_id:
-        return None
-    return user_id
-
-
-def is_admin():
-    """Check if current user is admin."""
-    user_id = get_current_user_id()
-    if not user_id:
-        return False
-    
-    user = User.query.get(user_id)
-    if not user:
-        return False
-    
-    return user.is_admin()
-
-
 @bp.route('/<int:event_id>/settle', methods=['POST'])
+@admin_required
 def settle_event(event_id):
     """Settle an event (admin only)."""
-    if not is_admin():
-        return jsonify({'error': 'Admin access required'}), 403
-    
     try:
         data = request.get_json() or {}
         source = data.get('source', 'event_result')
@@ -47,11 +26,9 @@ def settle_event(event_id):
 
 
 @bp.route('/<int:event_id>/settlement-preview', methods=['GET'])
+@admin_required
 def preview_settlement(event_id):
     """Preview what settlement would look like (admin only)."""
-    if not is_admin():
-        return jsonify({'error': 'Admin access required'}), 403
-    
     try:
         preview = SettlementService.preview_settlement(event_id)
         return jsonify(preview), 200
@@ -65,7 +42,7 @@ def preview_settlement(event_id):
 def get_event(event_id):
     """Get event information."""
     try:
-        event = Event.query.get(event_id)
+        event = db.session.get(Event, event_id, options=[raiseload('*')])
         if not event:
             return jsonify({'error': 'Event not found'}), 404
         
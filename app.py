@@ -6,13 +6,17 @@ from flask_cors import CORS
 from db import db
 from config import create_app_config
 from api import bp as main_bp
+from api.json_provider import OrjsonProvider
+from api.preflight import PreflightMiddleware, PREFLIGHT_MAX_AGE
 from api.f1_routes import bp as f1_bp
+from f1 import F1Service
 from api.market_routes import bp as market_bp
 from api.settlement_routes import bp as settlement_bp
 from api.browse_routes import bp as browse_bp
-from auth import bp as auth_bp
+from auth import bp as auth_bp, otp_purge
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure logging
 logging.basicConfig(
@@ -24,21 +28,37 @@ logger = logging.getLogger(__name__)
 # Configure the application
 create_app_config(app)
 
+# Server-side sessions (opt-in via REDIS_URL; signed-cookie sessions otherwise)
+if app.config.get('SESSION_TYPE'):
+    from flask_session import Session
+    Session(app)
+
 # CORS configuration - allow credentials for session cookies
 # In development, allow all origins. In production, you can restrict to specific domains.
 # Set CORS_ORIGINS env var (comma-separated) to restrict origins in production
 cors_origins = os.environ.get('CORS_ORIGINS')
-if cors_origins:
-    CORS(app, supports_credentials=True, origins=[origin.strip() for origin in cors_origins.split(',')])
+allowed_origins = [origin.strip() for origin in cors_origins.split(',')] if cors_origins else None
+if allowed_origins:
+    CORS(app, supports_credentials=True, expose_headers=['X-Next-Cursor'], max_age=PREFLIGHT_MAX_AGE, origins=allowed_origins)
 else:
-    CORS(app, supports_credentials=True)  # Allow all origins (development default)
+    CORS(app, supports_credentials=True, expose_headers=['X-Next-Cursor'], max_age=PREFLIGHT_MAX_AGE)  # Allow all origins (development default)
+
+# Answer CORS preflights in WSGI, before routing (same policy as above)
+app.wsgi_app = PreflightMiddleware(app.wsgi_app, origins=allowed_origins)
 
 # Initialize database
 db.init_app(app)
 
 # Create tables (fine for early dev; later you'll likely move to migrations)
-with app.app_context():
-    db.create_all()
+if app.config['CREATE_TABLES']:
+    with app.app_context():
+        db.create_all()
+
+# Shared F1 data service (holds the in-memory API cache across requests)
+app.extensions['f1_service'] = F1Service(
+    provider=app.config['F1_PROVIDER'],
+    cache_ttl_minutes=app.config['F1_CACHE_TTL_MINUTES'],
+)
 
 # Register routes
 app.register_blueprint(main_bp)
@@ -48,5 +68,12 @@ app.register_blueprint(market_bp)
 app.register_blueprint(settlement_bp)
 app.register_blueprint(browse_bp)
 
+# Expired OTPs are purged by the `flask purge-otps` command, not on every /auth/request-otp
+otp_purge.init_app(app)
+
+if app.config['PROFILE']:
+    from api import profiling
+    profiling.init_app(app)
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
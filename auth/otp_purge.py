@@ -0,0 +1,60 @@
+"""Purge of expired OTPs, run off the request path by the ``flask purge-otps`` command."""
+import logging
+from datetime import datetime
+
+import click
+from flask import Flask
+from sqlalchemy import delete, select
+
+from db import db, OTP
+
+logger = logging.getLogger(__name__)
+
+PURGE_BATCH_SIZE = 1000
+
+
+def purge_expired_otps(batch_size: int = PURGE_BATCH_SIZE) -> int:
+    """
+    Delete expired OTPs in batches, committing after each batch.
+
+    Batching keeps each DELETE's lock footprint small when a large backlog
+    of expired rows has built up.
+
+    Returns:
+        Number of OTP rows deleted
+    """
+    cutoff = datetime.utcnow()
+    total = 0
+    while True:
+        batch = select(OTP.id).where(OTP.expires_at < cutoff).limit(batch_size)
+        result = db.session.execute(
+            delete(OTP).where(OTP.id.in_(batch)),
+            execution_options={'synchronize_session': False},
+        )
+        db.session.commit()
+        total += result.rowcount
+        if result.rowcount < batch_size:
+            return total
+
+
+@click.command('purge-otps')
+@click.option('--batch-size', default=PURGE_BATCH_SIZE, show_default=True, help='Rows deleted per batch.')
+def purge_otps_command(batch_size: int) -> None:
+    """Delete expired OTPs; meant to be run periodically by cron."""
+    try:
+        deleted = purge_expired_otps(batch_size)
+    except Exception as e:
+        db.session.rollback()
+        logger.error(f"Error purging expired OTPs: {e}", exc_info=True)
+        raise click.ClickException(str(e))
+    click.echo(f"Purged {deleted} expired OTPs")
+
+
+def init_app(app: Flask) -> None:
+    """
+    Register the ``purge-otps`` CLI command.
+
+    Nothing runs at import: schedule ``flask --app app purge-otps`` once per
+    deployment (cron, Render cron job) rather than per worker process.
+    """
+    app.cli.add_command(purge_otps_command)
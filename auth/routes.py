@@ -1,9 +1,14 @@
 """Authentication routes and logic."""
 import re
-import random
+import secrets
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from flask import Blueprint, request, jsonify, session, current_app
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
 from db import db, User, UserRole, OTP
 from config import is_mailgun_configured, is_email_allowed
 from datetime import datetime, timedelta
@@ -12,16 +17,63 @@ logger = logging.getLogger(__name__)
 
 bp = Blueprint('auth', __name__)
 
+# Sends OTP emails off the request thread so /request-otp doesn't wait on Mailgun
+_EMAIL_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix='otp-email')
+
+# Keep-alive connections to the Mailgun API, reused across sends. The POST is
+# not in Retry's idempotent methods, so only connection failures are retried
+# (the message was never sent) and a slow response can't produce a duplicate email.
+_mailgun_http = requests.Session()
+_mailgun_http.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=1, backoff_factor=0.2),
+))
+
+
+# How long an issued code stays valid
+OTP_LIFETIME = timedelta(minutes=10)
+
+# Wrong guesses allowed per email within OTP_LIFETIME, summed over every code issued
+# in that window so requesting a new code doesn't reset the count
+OTP_MAX_ATTEMPTS = 5
+
+# Codes that can be requested per email within OTP_REQUEST_WINDOW
+OTP_MAX_REQUESTS = 5
+OTP_REQUEST_WINDOW = timedelta(minutes=5)
+
+# \Z (not $) so a trailing newline doesn't pass validation; the pattern is ASCII-only
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}\Z', re.ASCII)
+
 
 def is_valid_email(email: str) -> bool:
     """Validate email format."""
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(pattern, email) is not None
+    return _EMAIL_RE.match(email) is not None
 
 
 def generate_otp() -> str:
-    """Generate a 6-digit OTP."""
-    return str(random.randint(100000, 999999))
+    """Generate a 6-digit OTP from a cryptographically secure source."""
+    return f"{secrets.randbelow(1_000_000):06d}"
+
+
+def _submit_email(fn, *args):
+    """Run an email send on the background pool inside the current app's context."""
+    app = current_app._get_current_object()
+
+    def run():
+        with app.app_context():
+            return fn(*args)
+
+    return _EMAIL_POOL.submit(run)
+
+
+def _log_email_result(future) -> None:
+    """Done callback for background sends: surface failures send_otp_email didn't catch."""
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background OTP email send failed: {error}", exc_info=error)
+    elif not future.result():
+        logger.warning("Background OTP email was not delivered (see errors above)")
 
 
 def send_otp_email(email: str, otp_code: str, mailgun_configured: bool) -> bool:
@@ -31,15 +83,16 @@ def send_otp_email(email: str, otp_code: str, mailgun_configured: bool) -> bool:
         return False
 
     try:
-        api_key = current_app.config.get('MAILGUN_API_KEY')
-        domain = current_app.config.get('MAILGUN_DOMAIN')
-        from_email = current_app.config.get('MAILGUN_FROM_EMAIL')
+        config = current_app.config
+        url = config['MAILGUN_API_URL']
+        auth = config['MAILGUN_AUTH']
+        from_email = config['MAILGUN_FROM_EMAIL']
 
         # Validate configuration
-        if not api_key:
+        if not auth:
             logger.error("MAILGUN_API_KEY is not set")
             return False
-        if not domain:
+        if not url:
             logger.error("MAILGUN_DOMAIN is not set")
             return False
         if not from_email:
@@ -53,12 +106,11 @@ This code will expire in 10 minutes.
 
 If you didn't request this code, please ignore this email."""
 
-        url = f"https://api.mailgun.net/v3/{domain}/messages"
-        logger.info(f"Attempting to send OTP email to {email} via Mailgun (domain: {domain})")
+        logger.info(f"Attempting to send OTP email to {email} via Mailgun ({url})")
 
-        response = requests.post(
+        response = _mailgun_http.post(
             url,
-            auth=("api", api_key),
+            auth=auth,
             data={
                 "from": from_email,
                 "to": email,
@@ -76,7 +128,7 @@ If you didn't request this code, please ignore this email."""
             logger.error(
                 f"Mailgun API error - Status: {response.status_code}, "
                 f"Response: {response.text}, "
-                f"Domain: {domain}, "
+                f"URL: {url}, "
                 f"From: {from_email}"
             )
             return False
@@ -88,6 +140,34 @@ If you didn't request this code, please ignore this email."""
         return False
 
 
+def _replace_active_otp(email: str, otp_code: str) -> None:
+    """
+    Invalidate the email's unused OTPs and store a new one, committing both.
+
+    Two concurrent requests for the same email can both invalidate and then
+    both insert, and the loser trips uq_otps_active_email; it rolls back and
+    retries once, invalidating the winner's code in favour of its own.
+    """
+    for attempt in range(2):
+        db.session.execute(
+            update(OTP).where(OTP.email == email, OTP.used.is_(False)).values(used=True),
+            execution_options={'synchronize_session': False},
+        )
+        new_otp = OTP(
+            email=email,
+            expires_at=datetime.utcnow() + OTP_LIFETIME,
+        )
+        new_otp.set_code(otp_code)
+        db.session.add(new_otp)
+        try:
+            db.session.commit()
+            return
+        except IntegrityError:
+            db.session.rollback()
+            if attempt:
+                raise
+
+
 @bp.route('/request-otp', methods=['POST'])
 def request_otp():
     """Request an OTP to be sent to the user's email."""
@@ -105,49 +185,31 @@ def request_otp():
         if not is_email_allowed(current_app, email):
             return jsonify({'message': 'Email not authorized to request OTP'}), 403
 
-        # Clean up expired OTPs
-        expired_otps = OTP.query.filter(OTP.expires_at < datetime.utcnow()).all()
-        for otp in expired_otps:
-            db.session.delete(otp)
-
-        # Invalidate any existing unused OTPs for this email
-        existing_otps = OTP.query.filter_by(email=email, used=False).all()
-        for otp in existing_otps:
-            otp.used = True
+        recent_requests = db.session.scalar(
+            select(func.count()).select_from(OTP)
+            .where(OTP.email == email, OTP.created_at > datetime.utcnow() - OTP_REQUEST_WINDOW)
+        )
+        if recent_requests >= OTP_MAX_REQUESTS:
+            return jsonify({'message': 'Too many OTP requests, try again later'}), 429
 
         # Generate new OTP
         otp_code = generate_otp()
-        expires_at = datetime.utcnow() + timedelta(minutes=10)
-
-        new_otp = OTP(
-            email=email,
-            expires_at=expires_at,
-        )
-        new_otp.set_code(otp_code)
-
-        db.session.add(new_otp)
-        db.session.commit()
+        _replace_active_otp(email, otp_code)
 
         # Send OTP via email
         mailgun_configured = is_mailgun_configured(current_app)
         logger.info(f"Requesting OTP for {email} - Mailgun configured: {mailgun_configured}")
-        
-        email_sent = send_otp_email(email, otp_code, mailgun_configured)
-
-        if not email_sent and mailgun_configured:
-            logger.error(f"Failed to send OTP email to {email} despite Mailgun being configured")
-            return jsonify({
-                'message': 'Failed to send OTP email. Please check Mailgun configuration and logs.',
-                'error': 'email_send_failed'
-            }), 500
 
-        if email_sent:
-            logger.info(f"OTP successfully sent to {email}")
+        if mailgun_configured:
+            # Delivered in the background; the response doesn't wait on Mailgun
+            future = _submit_email(send_otp_email, email, otp_code, mailgun_configured)
+            future.add_done_callback(_log_email_result)
         else:
+            send_otp_email(email, otp_code, mailgun_configured)
             logger.warning(f"OTP generated but not sent (Mailgun not configured) - OTP: {otp_code}")
 
         return jsonify({
-            'message': 'OTP sent to your email' if email_sent else 'OTP generated (check console for debug)',
+            'message': 'OTP sent to your email' if mailgun_configured else 'OTP generated (check console for debug)',
             'email': email,
         }), 200
 
@@ -168,48 +230,74 @@ def verify_otp():
         if not email or not otp_code:
             return jsonify({'message': 'Email and OTP are required'}), 400
 
-        # Find valid OTPs for this email (we can't filter by code since it's hashed)
-        otps = OTP.query.filter_by(
-            email=email,
-            used=False,
-        ).order_by(OTP.created_at.desc()).all()
+        now = datetime.utcnow()
+
+        # Count this attempt against the email's active code before checking it. The
+        # UPDATE locks the row, so concurrent guesses serialize here and each one
+        # sees the others' increments instead of all reading the same stale sum
+        db.session.execute(
+            update(OTP).where(OTP.email == email, OTP.used.is_(False))
+            .values(attempts=OTP.attempts + 1),
+            execution_options={'synchronize_session': False},
+        )
 
-        # Find the matching OTP by verifying the code
-        otp = None
-        for candidate_otp in otps:
-            if candidate_otp.is_valid() and candidate_otp.verify_code(otp_code):
-                otp = candidate_otp
-                break
+        # Attempts on codes issued within the lifetime window, including replaced ones
+        attempts = db.session.scalar(
+            select(func.coalesce(func.sum(OTP.attempts), 0))
+            .where(OTP.email == email, OTP.created_at > now - OTP_LIFETIME)
+        )
+        if attempts > OTP_MAX_ATTEMPTS:
+            db.session.commit()
+            return jsonify({'message': 'Too many failed attempts, try again later'}), 429
+
+        # The email's one active OTP (uq_otps_active_email); codes are stored as a
+        # deterministic HMAC, so the code check happens in the same lookup
+        otp = OTP.query.filter(
+            OTP.email == email,
+            OTP.used.is_(False),
+            OTP.expires_at > now,
+            OTP.code_hash == OTP.hash_code(email, otp_code),
+        ).first()
 
         if not otp:
+            # The miss stays counted (brute-force limit)
+            db.session.commit()
             return jsonify({'message': 'Invalid or expired OTP'}), 401
 
-        # Mark OTP as used
+        # Mark OTP as used; the attempt succeeded, so it doesn't count as a failure
         otp.used = True
+        otp.attempts = OTP.attempts - 1
 
-        # Find or create user
-        user = User.query.filter_by(email=email).first()
-        if not user:
-            user = User(
+        # Find or create user; existing users are read as a plain row, not a mapped User
+        user = db.session.execute(
+            select(User.id, User.email, User.username, User.role).where(User.email == email)
+        ).first()
+        if user:
+            user_id, user_email, username, role = user
+        else:
+            new_user = User(
                 email=email,
                 username=email.split('@')[0],
                 role=UserRole.PLAYER.value,
             )
-            db.session.add(user)
+            db.session.add(new_user)
+            db.session.flush()  # assign new_user.id
+            # Read the profile before commit expires it, so no refresh SELECT follows
+            user_id, user_email, username, role = new_user.id, new_user.email, new_user.username, new_user.role
 
         db.session.commit()
 
         # Create session
-        session['user_id'] = user.id
-        session['email'] = user.email
-        session['username'] = user.username
-        session['role'] = user.role
+        session['user_id'] = user_id
+        session['email'] = user_email
+        session['username'] = username
+        session['role'] = role
 
         return jsonify({
             'message': 'Login successful!',
-            'email': user.email,
-            'username': user.username,
-            'role': user.role,
+            'email': user_email,
+            'username': username,
+            'role': role,
         }), 200
 
     except Exception as e:
@@ -222,8 +310,23 @@ def verify_otp():
 def get_current_user():
     """Get the current logged-in user from session."""
     if 'user_id' in session:
-        user = User.query.get(session['user_id'])
+        # verify_otp stores the profile in the signed session; serve it from there
+        if 'email' in session and 'role' in session:
+            return jsonify({
+                'email': session['email'],
+                'username': session.get('username'),
+                'role': session['role'],
+                'logged_in': True,
+            }), 200
+
+        # Older sessions without the profile: only the serialized columns, as a plain row
+        user = db.session.execute(
+            select(User.email, User.username, User.role).where(User.id == session['user_id'])
+        ).first()
         if user:
+            session['email'] = user.email
+            session['username'] = user.username
+            session['role'] = user.role
             return jsonify({
                 'email': user.email,
                 'username': user.username,
@@ -10,11 +10,14 @@ load_dotenv()
 
 def create_app_config(app: Flask) -> None:
     """Configure Flask application with all settings."""
+    # Read the process environment once; every setting below comes from this snapshot
+    env_vars = dict(os.environ)
+
     # Environment
-    env = os.environ.get('FLASK_ENV', 'development').lower()
+    env = env_vars.get('FLASK_ENV', 'development').lower()
 
     # Session configuration
-    secret_key = os.environ.get('SECRET_KEY')
+    secret_key = env_vars.get('SECRET_KEY')
     if env == 'production':
         if not secret_key:
             raise RuntimeError("SECRET_KEY must be set in production")
@@ -26,10 +29,30 @@ def create_app_config(app: Flask) -> None:
     app.config['SESSION_COOKIE_HTTPONLY'] = True
     app.config['SESSION_COOKIE_SAMESITE'] = 'Lax'
 
+    # Server-side sessions: when REDIS_URL is set, session data lives in Redis
+    # and the cookie only carries the session id (see Session(app) in app.py)
+    redis_url = env_vars.get('REDIS_URL')
+    if redis_url:
+        import redis
+        # One bounded keep-alive pool per worker; short timeouts so a slow
+        # Redis fails requests fast instead of tying up worker threads
+        pool = redis.ConnectionPool.from_url(
+            redis_url,
+            max_connections=int(env_vars.get('REDIS_MAX_CONNECTIONS', '16')),
+            socket_timeout=2,
+            socket_connect_timeout=2,
+            socket_keepalive=True,
+            health_check_interval=30,
+        )
+        app.config['SESSION_TYPE'] = 'redis'
+        app.config['SESSION_REDIS'] = redis.Redis(connection_pool=pool)
+        app.config['SESSION_KEY_PREFIX'] = 'f1market:session:'
+        app.config['SESSION_PERMANENT'] = False
+
     # Database configuration
     if env == 'production':
         # In production, prefer INTERNAL_PROD_DATABASE_URL
-        database_url = os.environ.get('INTERNAL_PROD_DATABASE_URL')
+        database_url = env_vars.get('INTERNAL_PROD_DATABASE_URL')
         if not database_url:
             raise RuntimeError("INTERNAL_PROD_DATABASE_URL or DATABASE_URL must be set in production")
         # Ensure we use psycopg (v3) driver instead of psycopg2
@@ -38,52 +61,79 @@ def create_app_config(app: Flask) -> None:
         elif database_url.startswith('postgres://'):
             database_url = database_url.replace('postgres://', 'postgresql+psycopg://', 1)
         app.config['SQLALCHEMY_DATABASE_URI'] = database_url
+        # Per-worker pool sized for the gthread workers; pre-ping and recycle so
+        # connections dropped by the server are replaced instead of failing a request
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+            'pool_size': int(env_vars.get('DB_POOL_SIZE', '10')),
+            'max_overflow': int(env_vars.get('DB_MAX_OVERFLOW', '20')),
+            'pool_pre_ping': True,
+            'pool_recycle': 1800,
+            'pool_timeout': 5,
+            # Compiled-statement cache (SQLAlchemy default 500): room for every ORM query shape
+            'query_cache_size': 1200,
+        }
     else:
         basedir = os.path.abspath(os.path.dirname(__file__))
         app.config['SQLALCHEMY_DATABASE_URI'] = f'sqlite:///{os.path.join(basedir, "app.db")}'
 
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Run db.create_all() at startup? Defaults on in development only; in
+    # production create tables once (CREATE_TABLES=1 or db/init.py) rather than
+    # on every worker boot.
+    create_tables_default = '0' if env == 'production' else '1'
+    app.config['CREATE_TABLES'] = env_vars.get('CREATE_TABLES', create_tables_default) == '1'
+
+    # Request profiling (development only): cProfile output + SQL statement counts
+    app.config['PROFILE'] = env_vars.get('PROFILE') == '1'
+    app.config['PROFILE_DIR'] = env_vars.get('PROFILE_DIR') or None
+
     # Mailgun configuration
-    app.config['MAILGUN_API_KEY'] = os.environ.get('MAILGUN_API_KEY')
-    app.config['MAILGUN_DOMAIN'] = os.environ.get('MAILGUN_DOMAIN')
+    app.config['MAILGUN_API_KEY'] = env_vars.get('MAILGUN_API_KEY')
+    mailgun_domain = env_vars.get('MAILGUN_DOMAIN', '')
+    app.config['MAILGUN_DOMAIN'] = mailgun_domain or None
 
     # Default from email: if MAILGUN_DOMAIN is mg.gridstock.io, use noreply@gridstock.io
-    mailgun_domain = os.environ.get('MAILGUN_DOMAIN', '')
     if mailgun_domain.startswith('mg.'):
         default_from = f'noreply@{mailgun_domain[3:]}'  # Remove 'mg.' prefix
     else:
         default_from = f'noreply@{mailgun_domain}' if mailgun_domain else 'noreply@example.com'
-    app.config['MAILGUN_FROM_EMAIL'] = os.environ.get('MAILGUN_FROM_EMAIL', default_from)
+    app.config['MAILGUN_FROM_EMAIL'] = env_vars.get('MAILGUN_FROM_EMAIL', default_from)
+
+    # Derived once here rather than on every send
+    app.config['MAILGUN_API_URL'] = f'https://api.mailgun.net/v3/{mailgun_domain}/messages' if mailgun_domain else None
+    app.config['MAILGUN_AUTH'] = ('api', app.config['MAILGUN_API_KEY']) if app.config['MAILGUN_API_KEY'] else None
+    app.config['MAILGUN_CONFIGURED'] = bool(app.config['MAILGUN_API_KEY'] and app.config['MAILGUN_DOMAIN'])
 
     # F1 API configuration (SportsMonk)
-    app.config['F1_PROVIDER'] = os.environ.get('F1_PROVIDER', 'sportmonks')
-    app.config['F1_SPORTSMONK_BASE_URL'] = os.environ.get('F1_SPORTSMONK_BASE_URL', 'https://f1.sportmonks.com/api/v1.0')
-    app.config['SPORTSMONK_API_KEY'] = os.environ.get('SPORTSMONK_API_KEY')
-    app.config['F1_CACHE_TTL_MINUTES'] = int(os.environ.get('F1_CACHE_TTL_MINUTES', '10'))
+    app.config['F1_PROVIDER'] = env_vars.get('F1_PROVIDER', 'sportmonks')
+    app.config['F1_SPORTSMONK_BASE_URL'] = env_vars.get('F1_SPORTSMONK_BASE_URL', 'https://f1.sportmonks.com/api/v1.0')
+    app.config['SPORTSMONK_API_KEY'] = env_vars.get('SPORTSMONK_API_KEY')
+    app.config['F1_CACHE_TTL_MINUTES'] = int(env_vars.get('F1_CACHE_TTL_MINUTES', '10'))
 
     # Email allowlist for OTP requests (comma-separated list)
-    allowed_emails_str = os.environ.get('OTP_ALLOWED_EMAILS', '')
+    allowed_emails_str = env_vars.get('OTP_ALLOWED_EMAILS', '')
     if allowed_emails_str:
         # Parse comma-separated list and normalize (lowercase, strip whitespace)
         allowed_emails = [email.strip().lower() for email in allowed_emails_str.split(',') if email.strip()]
-        app.config['OTP_ALLOWED_EMAILS'] = set(allowed_emails)
+        app.config['OTP_ALLOWED_EMAILS'] = frozenset(allowed_emails)
     else:
         app.config['OTP_ALLOWED_EMAILS'] = None  # None means no allowlist (allow all)
 
 
 
 def is_mailgun_configured(app: Flask) -> bool:
-    """Check if Mailgun is properly configured."""
-    return bool(app.config['MAILGUN_API_KEY'] and app.config['MAILGUN_DOMAIN'])
+    """Check if Mailgun is properly configured (computed once in create_app_config)."""
+    return app.config['MAILGUN_CONFIGURED']
 
 
 def is_email_allowed(app: Flask, email: str) -> bool:
-    """Check if an email is in the allowlist for OTP requests."""
-    allowed_emails = app.config.get('OTP_ALLOWED_EMAILS')
-    if allowed_emails is None:
-        # No allowlist configured, allow all emails
-        return True
-    # Normalize email for comparison
-    return email.strip().lower() in allowed_emails
+    """
+    Check if an email is in the allowlist for OTP requests.
+
+    The email must already be normalized (stripped, lowercased), as request_otp does.
+    """
+    allowed_emails = app.config['OTP_ALLOWED_EMAILS']
+    # None means no allowlist is configured (allow all)
+    return allowed_emails is None or email in allowed_emails
 
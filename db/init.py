@@ -3,6 +3,7 @@ Script to initialize the database with some default users.
 Note: With OTP-based authentication, users are created automatically on first login.
 This script can be used to pre-create users if needed.
 """
+from sqlalchemy import select
 from app import app
 from db import db, User, UserRole
 
@@ -20,19 +21,19 @@ def init_users():
             {"email": "test@example.com",  "username": "test",  "role": UserRole.PLAYER.value},
         ]
         
+        # One query for the users that already exist, one batched INSERT for the rest
+        emails = [user_data["email"] for user_data in default_users]
+        existing = set(db.session.scalars(select(User.email).where(User.email.in_(emails))))
+        
+        new_users = []
         for user_data in default_users:
-            existing_user = User.query.filter_by(email=user_data["email"]).first()
-            if not existing_user:
-                new_user = User(
-                    email=user_data["email"],
-                    username=user_data["username"],
-                    role=user_data["role"],
-                )
-                db.session.add(new_user)
-                print(f"Created user: {user_data['email']} (role: {user_data['role']})")
-            else:
+            if user_data["email"] in existing:
                 print(f"User {user_data['email']} already exists, skipping...")
+                continue
+            new_users.append(User(**user_data))
+            print(f"Created user: {user_data['email']} (role: {user_data['role']})")
         
+        db.session.add_all(new_users)
         db.session.commit()
         print("Database initialization complete!")
         print("\nNote: Users will need to use OTP login to authenticate.")
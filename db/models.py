@@ -1,12 +1,47 @@
 """Database models."""
+from flask import current_app
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import event, select
+from sqlalchemy.types import TypeDecorator
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 import enum
+import hashlib
+import hmac
 from decimal import Decimal
-from passlib.context import CryptContext
 
 db = SQLAlchemy()
-otp_context = CryptContext(schemes=["argon2"], deprecated="auto")
+
+# Binary, indexable JSONB on Postgres; plain JSON on the SQLite dev database
+JSONDocument = JSONB().with_variant(db.JSON(), 'sqlite')
+
+
+class SmallIntEnum(TypeDecorator):
+    """
+    Store a Python Enum as a SMALLINT code rather than a database ENUM type.
+    
+    Codes follow member declaration order starting at 1, so new members must be
+    appended to the Enum class, never inserted or reordered.
+    """
+    impl = db.SmallInteger
+    cache_ok = True
+    
+    def __init__(self, enum_class):
+        super().__init__()
+        self.enum_class = enum_class
+        self._members = dict(enumerate(enum_class, start=1))
+        self._codes = {member: code for code, member in self._members.items()}
+    
+    @staticmethod
+    def code_of(member: enum.Enum) -> int:
+        """Stored code for an Enum member (e.g. for raw SQL such as index predicates)."""
+        return list(type(member)).index(member) + 1
+    
+    def process_bind_param(self, value, dialect):
+        return None if value is None else self._codes[value]
+    
+    def process_result_value(self, value, dialect):
+        return None if value is None else self._members[value]
 
 class UserRole(enum.Enum):
     PLAYER = "player"
@@ -37,21 +72,45 @@ class OTP(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     email = db.Column(db.String(120), nullable=False, index=True)
-    code_hash = db.Column(db.String(255), nullable=False)
+    # Keyed HMAC-SHA256 of email + code; deterministic, so verification is an indexed lookup
+    code_hash = db.Column(db.String(255), nullable=False, index=True)
     expires_at = db.Column(db.DateTime, nullable=False, index=True)
     used = db.Column(db.Boolean, default=False, nullable=False)
+    # Failed verifications against this code; verify_otp sums these per email over recent codes
+    attempts = db.Column(db.Integer, default=0, server_default='0', nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
+    # At most one unused OTP per email (request_otp invalidates the previous one
+    # before inserting), so verification is a single-row index lookup
+    __table_args__ = (
+        db.Index(
+            'uq_otps_active_email', 'email', unique=True,
+            postgresql_where=db.text('used = false'),
+            sqlite_where=db.text('used = 0'),
+        ),
+    )
+    
     def __repr__(self):
         return f'<OTP {self.email}>'
     
+    @staticmethod
+    def hash_code(email: str, code: str) -> str:
+        """
+        Hash an email/code pair with HMAC-SHA256 keyed by the app secret.
+
+        OTPs are short-lived and attempt-limited, so a slow password hash buys
+        nothing here; the secret key keeps the hashes useless without it.
+        """
+        key = current_app.config['SECRET_KEY'].encode()
+        return hmac.new(key, f'{email}:{code}'.encode(), hashlib.sha256).hexdigest()
+    
     def set_code(self, code: str):
-        """Hash and store the OTP code."""
-        self.code_hash = otp_context.hash(code)
+        """Hash and store the OTP code (email must be set first)."""
+        self.code_hash = OTP.hash_code(self.email, code)
     
     def verify_code(self, code: str) -> bool:
-        """Verify an OTP code against the stored hash."""
-        return otp_context.verify(code, self.code_hash)
+        """Verify an OTP code against the stored hash (constant-time compare)."""
+        return hmac.compare_digest(self.code_hash, OTP.hash_code(self.email, code))
     
     def is_valid(self):
         """Check if OTP is still valid (not expired and not used)."""
@@ -150,7 +209,7 @@ class Season(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     league_id = db.Column(db.Integer, db.ForeignKey('leagues.id'), nullable=False, index=True)
     year = db.Column(db.Integer, nullable=False, index=True)
-    status = db.Column(db.Enum(SeasonStatus), nullable=False, default=SeasonStatus.UPCOMING, index=True)
+    status = db.Column(SmallIntEnum(SeasonStatus), nullable=False, default=SeasonStatus.UPCOMING, index=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -165,14 +224,23 @@ class Event(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     season_id = db.Column(db.Integer, db.ForeignKey('seasons.id'), nullable=False, index=True)
+    # Copied from season -> league on insert (see _set_event_sport); never changes
+    sport_id = db.Column(db.Integer, db.ForeignKey('sports.id'), nullable=True, index=True)
     name = db.Column(db.String(200), nullable=False)
     venue = db.Column(db.String(200), nullable=True)
     start_at = db.Column(db.DateTime, nullable=True, index=True)
     end_at = db.Column(db.DateTime, nullable=True)
-    status = db.Column(db.Enum(EventStatus), nullable=False, default=EventStatus.UPCOMING, index=True)
-    metadata_json = db.Column(db.JSON, nullable=True)  # Sport-specific info
+    status = db.Column(SmallIntEnum(EventStatus), nullable=False, default=EventStatus.UPCOMING, index=True)
+    metadata_json = db.Column(JSONDocument, nullable=True)  # Sport-specific info
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        db.Index('ix_events_season_status', 'season_id', 'status'),
+        # Serves metadata_json containment (@>) lookups, e.g. by f1_stage_id
+        db.Index('ix_events_metadata_json', 'metadata_json',
+                 postgresql_using='gin', postgresql_ops={'metadata_json': 'jsonb_path_ops'}),
+    )
+    
     # Relationships
     markets = db.relationship('Market', backref='event', lazy=True)
     results = db.relationship('EventResult', backref='event', lazy=True)
@@ -181,6 +249,17 @@ class Event(db.Model):
         return f'<Event {self.name} ({self.status.value})>'
 
 
+@event.listens_for(Event, 'before_insert')
+def _set_event_sport(mapper, connection, target):
+    """Denormalize the event's sport so sport filters don't join through season/league."""
+    if target.sport_id is None:
+        target.sport_id = connection.execute(
+            select(League.sport_id)
+            .join(Season, Season.league_id == League.id)
+            .where(Season.id == target.season_id)
+        ).scalar()
+
+
 class Participant(db.Model):
     __tablename__ = 'participants'
     
@@ -188,8 +267,14 @@ class Participant(db.Model):
     sport_id = db.Column(db.Integer, db.ForeignKey('sports.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     short_code = db.Column(db.String(50), nullable=True, index=True)
-    metadata_json = db.Column(db.JSON, nullable=True)  # team, position, jersey number, constructor, etc.
+    metadata_json = db.Column(JSONDocument, nullable=True)  # team, position, jersey number, constructor, etc.
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Serves metadata_json containment (@>) lookups, e.g. by f1_driver_id
+        db.Index('ix_participants_metadata_json', 'metadata_json',
+                 postgresql_using='gin', postgresql_ops={'metadata_json': 'jsonb_path_ops'}),
+    )
     
     # Relationships
     assets = db.relationship('Asset', foreign_keys='Asset.participant_id', backref='participant', lazy=True)
@@ -207,7 +292,7 @@ class Team(db.Model):
     sport_id = db.Column(db.Integer, db.ForeignKey('sports.id'), nullable=False, index=True)
     name = db.Column(db.String(200), nullable=False)
     short_code = db.Column(db.String(50), nullable=True, index=True)
-    metadata_json = db.Column(db.JSON, nullable=True)
+    metadata_json = db.Column(JSONDocument, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
@@ -241,7 +326,9 @@ class Asset(db.Model):
     __tablename__ = 'assets'
     
     id = db.Column(db.Integer, primary_key=True)
-    type = db.Column(db.Enum(AssetType), nullable=False, index=True)
+    # Column stays "type"; the attribute is asset_type so the name doesn't shadow the
+    # builtin while Flask-SQLAlchemy evaluates its ClassVar[type[Query]] annotation in the class body
+    asset_type = db.Column('type', SmallIntEnum(AssetType), nullable=False, index=True)
     participant_id = db.Column(db.Integer, db.ForeignKey('participants.id'), nullable=True, index=True)
     team_id = db.Column(db.Integer, db.ForeignKey('teams.id'), nullable=True, index=True)
     symbol = db.Column(db.String(50), unique=True, nullable=False, index=True)
@@ -252,7 +339,7 @@ class Asset(db.Model):
     markets = db.relationship('Market', backref='asset', lazy=True)
     
     def __repr__(self):
-        return f'<Asset {self.symbol} ({self.type.value})>'
+        return f'<Asset {self.symbol} ({self.asset_type.value})>'
 
 
 class Market(db.Model):
@@ -260,35 +347,67 @@ class Market(db.Model):
     
     id = db.Column(db.Integer, primary_key=True)
     event_id = db.Column(db.Integer, db.ForeignKey('events.id'), nullable=False, index=True)
+    # Copied from event -> season -> league on insert (see _set_market_sport); never changes
+    sport_id = db.Column(db.Integer, db.ForeignKey('sports.id'), nullable=True, index=True)
     asset_id = db.Column(db.Integer, db.ForeignKey('assets.id'), nullable=False, index=True)
     scoring_rule_id = db.Column(db.Integer, db.ForeignKey('scoring_rules.id'), nullable=False, index=True)
     market_type = db.Column(db.String(50), nullable=False, default='outright')
-    status = db.Column(db.Enum(MarketStatus), nullable=False, default=MarketStatus.OPEN, index=True)
+    status = db.Column(SmallIntEnum(MarketStatus), nullable=False, default=MarketStatus.OPEN, index=True)
     a = db.Column(db.Numeric(precision=18, scale=8), nullable=False)  # Bonding curve param
     b = db.Column(db.Numeric(precision=18, scale=8), nullable=False)  # Bonding curve baseline
+    # Total shares outstanding (SUM of positions.shares), kept current by trades and settlement
+    supply = db.Column(db.Numeric(precision=18, scale=8), nullable=False, default=0, server_default='0')
+    # Price after the most recent trade (mirrors the newest PriceHistory row); NULL until first trade
+    last_price = db.Column(db.Numeric(precision=18, scale=8), nullable=True)
+    last_price_at = db.Column(db.DateTime, nullable=True)
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
+    __table_args__ = (
+        db.Index('ix_markets_event_status', 'event_id', 'status'),
+        # Open markets are a small slice of the table; serves ?status=open listings paged by id
+        db.Index(
+            'ix_markets_open', 'id',
+            postgresql_where=db.text(f"status = {SmallIntEnum.code_of(MarketStatus.OPEN)}"),
+            sqlite_where=db.text(f"status = {SmallIntEnum.code_of(MarketStatus.OPEN)}"),
+        ),
+    )
+    
     # Relationships
     positions = db.relationship('Position', backref='market', lazy=True)
     trades = db.relationship('Trade', backref='market', lazy=True)
-    price_history = db.relationship('PriceHistory', backref='market', lazy=True, order_by='PriceHistory.timestamp.desc()')
+    # Unbounded series: read it with MarketService.get_recent_price_history, never via the relationship
+    price_history = db.relationship('PriceHistory', backref='market', lazy='raise')
     settlement = db.relationship('MarketSettlement', backref='market', uselist=False, lazy=True)
     
     def __repr__(self):
         return f'<Market {self.id} ({self.status.value})>'
 
 
+@event.listens_for(Market, 'before_insert')
+def _set_market_sport(mapper, connection, target):
+    """Denormalize the market's sport (copied from its event) so sport filters skip the join."""
+    if target.sport_id is None:
+        target.sport_id = connection.execute(
+            select(Event.sport_id).where(Event.id == target.event_id)
+        ).scalar()
+
+
 class PriceHistory(db.Model):
     __tablename__ = 'price_history'
     
     id = db.Column(db.Integer, primary_key=True)
-    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False, index=True)
-    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False)
+    timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
     price = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
     reason = db.Column(db.String(200), nullable=True)  # e.g., "buy", "sell", "settlement"
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
+    # Latest N points per market; also covers market_id lookups, so no single-column indexes
+    __table_args__ = (
+        db.Index('ix_price_history_market_ts', 'market_id', timestamp.desc(), postgresql_include=['price']),
+    )
+    
     def __repr__(self):
         return f'<PriceHistory {self.market_id} @ {self.timestamp}: {self.price}>'
 
@@ -297,8 +416,8 @@ class Position(db.Model):
     __tablename__ = 'positions'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
-    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False)
     shares = db.Column(db.Numeric(precision=18, scale=8), nullable=False, default=Decimal('0'))
     avg_entry_price = db.Column(db.Numeric(precision=18, scale=8), nullable=False, default=Decimal('0'))
     realized_pnl = db.Column(db.Numeric(precision=18, scale=8), nullable=False, default=Decimal('0'))
@@ -306,8 +425,13 @@ class Position(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
-    # Unique constraint: one position per user per market
-    __table_args__ = (db.UniqueConstraint('user_id', 'market_id', name='uq_user_market'),)
+    # Unique constraint: one position per user per market; its (user_id, market_id)
+    # index also serves per-user lookups. The market_id index covers shares
+    # (PostgreSQL) so supply sums are index-only scans.
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'market_id', name='uq_user_market'),
+        db.Index('ix_positions_market_shares', 'market_id', postgresql_include=['shares']),
+    )
     
     # Relationships
     user = db.relationship('User', backref='positions')
@@ -320,12 +444,15 @@ class Trade(db.Model):
     __tablename__ = 'trades'
     
     id = db.Column(db.Integer, primary_key=True)
-    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False, index=True)
+    market_id = db.Column(db.Integer, db.ForeignKey('markets.id'), nullable=False)
     buyer_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
     seller_user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True, index=True)
     price = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
     quantity = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
-    executed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    executed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # Recent trades per market (and market_id lookups)
+    __table_args__ = (db.Index('ix_trades_market_executed', 'market_id', executed_at.desc()),)
     
     # Relationships
     buyer = db.relationship('User', foreign_keys=[buyer_user_id], backref='buy_trades')
@@ -360,14 +487,20 @@ class LedgerEntry(db.Model):
     __tablename__ = 'ledger_entries'
     
     id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     wallet_id = db.Column(db.Integer, db.ForeignKey('wallets.id'), nullable=False, index=True)
     amount = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
-    transaction_type = db.Column(db.Enum(TransactionType), nullable=False, index=True)
+    transaction_type = db.Column(SmallIntEnum(TransactionType), nullable=False, index=True)
     reference_type = db.Column(db.String(50), nullable=True)  # e.g., "market", "event"
     reference_id = db.Column(db.Integer, nullable=True, index=True)
     description = db.Column(db.String(500), nullable=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    # user_id lookups are served by the composites' leading column
+    __table_args__ = (
+        db.Index('ix_ledger_entries_user_created', 'user_id', created_at.desc()),
+        db.Index('ix_ledger_entries_user_type_created', 'user_id', 'transaction_type', created_at.desc()),
+    )
     
     # Relationships
     user = db.relationship('User', backref='ledger_entries')
@@ -388,8 +521,8 @@ class EventResult(db.Model):
     participant_id = db.Column(db.Integer, db.ForeignKey('participants.id'), nullable=False, index=True)
     primary_score = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
     rank = db.Column(db.Integer, nullable=True, index=True)
-    status = db.Column(db.Enum(ResultStatus), nullable=False, default=ResultStatus.FINISHED, index=True)
-    metrics_json = db.Column(db.JSON, nullable=True)  # Additional sport-specific metrics
+    status = db.Column(SmallIntEnum(ResultStatus), nullable=False, default=ResultStatus.FINISHED, index=True)
+    metrics_json = db.Column(JSONDocument, nullable=True)  # Additional sport-specific metrics
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Unique constraint: one result per participant per event
@@ -408,8 +541,8 @@ class ScoringRule(db.Model):
     max_score = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
     alpha = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
     beta = db.Column(db.Numeric(precision=18, scale=8), nullable=False)
-    formula_type = db.Column(db.Enum(FormulaType), nullable=False, default=FormulaType.LINEAR_NORMALIZED)
-    config_json = db.Column(db.JSON, nullable=True)  # Additional formula parameters
+    formula_type = db.Column(SmallIntEnum(FormulaType), nullable=False, default=FormulaType.LINEAR_NORMALIZED)
+    config_json = db.Column(JSONDocument, nullable=True)  # Additional formula parameters
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     
     # Relationships
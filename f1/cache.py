@@ -1,23 +1,30 @@
 """In-memory caching utilities for F1 API data."""
-from typing import Dict, Optional, Any
-from datetime import datetime, timedelta
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
 
 
 class Cache:
-    """Simple in-memory cache with TTL support."""
+    """In-memory LRU cache with per-entry TTL support."""
 
-    def __init__(self, provider: str = "sportmonks", ttl_minutes: int = 10):
+    def __init__(self, provider: str = "sportmonks", ttl_minutes: int = 10, max_entries: int = DEFAULT_MAX_ENTRIES):
         """
         Initialize cache.
 
         Args:
             provider: Provider name for cache key prefix
             ttl_minutes: Cache TTL in minutes (default: 10)
+            max_entries: Entries kept before the least recently used is evicted
         """
         self.provider = provider
-        self._cache: Dict[str, Any] = {}
-        self._cache_timestamps: Dict[str, datetime] = {}
-        self._cache_ttl = timedelta(minutes=ttl_minutes)
+        # key -> (value, expires_at on the monotonic clock), oldest use first
+        self._cache: "OrderedDict[str, Tuple[Any, float]]" = OrderedDict()
+        self._cache_ttl = ttl_minutes * 60
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
 
     def get_cache_key(self, key: str) -> str:
         """Generate cache key with provider prefix."""
@@ -34,24 +41,30 @@ class Cache:
             Cached value or None if not found or expired
         """
         cache_key = self.get_cache_key(key)
-        if cache_key in self._cache:
-            ts = self._cache_timestamps.get(cache_key)
-            if ts and datetime.utcnow() - ts < self._cache_ttl:
-                return self._cache[cache_key]
-            # expired
-            self._cache.pop(cache_key, None)
-            self._cache_timestamps.pop(cache_key, None)
-        return None
-
-    def set(self, key: str, value: Any):
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if time.monotonic() >= expires_at:
+                del self._cache[cache_key]
+                return None
+            self._cache.move_to_end(cache_key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_minutes: Optional[int] = None):
         """
-        Set cached value with current timestamp.
+        Set cached value, evicting the least recently used entry when full.
 
         Args:
             key: Cache key
             value: Value to cache
+            ttl_minutes: TTL for this entry (defaults to the cache TTL)
         """
         cache_key = self.get_cache_key(key)
-        self._cache[cache_key] = value
-        self._cache_timestamps[cache_key] = datetime.utcnow()
-
+        ttl = ttl_minutes * 60 if ttl_minutes is not None else self._cache_ttl
+        with self._lock:
+            self._cache[cache_key] = (value, time.monotonic() + ttl)
+            self._cache.move_to_end(cache_key)
+            if len(self._cache) > self._max_entries:
+                self._cache.popitem(last=False)
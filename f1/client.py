@@ -1,27 +1,62 @@
 """HTTP client for SportMonks F1 API."""
+import orjson
 import requests
-from typing import Dict, Optional, Any
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Optional, Any, Tuple
 from flask import current_app
 
 
+def _make_session() -> requests.Session:
+    """Pooled keep-alive session for SportMonks, retrying idempotent GETs on transient errors."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=32,
+        max_retries=Retry(
+            total=2,
+            backoff_factor=0.2,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
 class F1APIClient:
     """HTTP client for making requests to SportMonks F1 API."""
 
+    # Shared by every client instance (the app's F1Service, seeding scripts),
+    # so keep-alive connections and their TLS handshakes are reused process-wide
+    _http = _make_session()
+
     def __init__(self):
-        """Initialize the API client."""
-        pass
+        # (base_url, api_key), read from app config on first use; config is
+        # fixed once the app is created, so later calls skip current_app
+        self._config: Optional[Tuple[str, Optional[str]]] = None
+
+    def _resolve_config(self) -> Tuple[str, Optional[str]]:
+        """Read and memoize the base URL and API key from the app config."""
+        if self._config is None:
+            config = current_app.config
+            # Official base URL: https://f1.sportmonks.com/api/v1.0
+            base_url = config.get(
+                "F1_SPORTSMONK_BASE_URL",
+                "https://f1.sportmonks.com/api/v1.0",
+            )
+            self._config = (base_url.rstrip("/"), config.get("SPORTSMONK_API_KEY"))
+        return self._config
 
     def get_base_url(self) -> str:
         """Get SportMonks F1 API base URL."""
-        # Official base URL: https://f1.sportmonks.com/api/v1.0
-        return current_app.config.get(
-            "F1_SPORTSMONK_BASE_URL",
-            "https://f1.sportmonks.com/api/v1.0",
-        )
+        return self._resolve_config()[0]
 
     def get_api_key(self) -> Optional[str]:
         """Get SportMonks API key from config."""
-        return current_app.config.get("SPORTSMONK_API_KEY")
+        return self._resolve_config()[1]
 
     def make_request(
         self,
@@ -40,12 +75,11 @@ class F1APIClient:
         Returns:
             JSON response (usually the 'data' field) or None if error
         """
-        api_key = self.get_api_key()
+        base_url, api_key = self._resolve_config()
         if not api_key:
             print("SportMonks API key not configured")
             return None
 
-        base_url = self.get_base_url()
         # Ensure endpoint starts with '/'
         if not endpoint.startswith("/"):
             endpoint = f"/{endpoint}"
@@ -56,9 +90,10 @@ class F1APIClient:
         params["api_token"] = api_key
 
         try:
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self._http.get(url, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            # orjson parses the large season/driver payloads much faster than stdlib json
+            data = orjson.loads(resp.content)
             if include_data and isinstance(data, dict) and "data" in data:
                 return data["data"]
             return data
@@ -70,4 +105,7 @@ class F1APIClient:
                 except Exception:
                     print("Error response text:", e.response.text)
             return None
+        except orjson.JSONDecodeError as e:
+            print(f"SportMonks API returned invalid JSON: {e}")
+            return None
 
@@ -1,11 +1,35 @@
 """Race-related functionality for F1 API."""
-from typing import Dict, List, Optional, Any
+import time
+from operator import itemgetter
+from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from .client import F1APIClient
 from .seasons import SeasonService
 from .teams import TeamService
 from .utils import calculate_race_points, DEFAULT_F1_POINTS_RULES
 
+# Races are ~2h: a stage that started within this many seconds may still be live
+LIVE_WINDOW_SECONDS = 3 * 3600
+# A race is over once its start is this many seconds in the past
+RACE_OVER_SECONDS = 2 * 3600
+
+# Stage statuses (lowercased) that mean the race has finished
+_FINISHED_STATUSES = frozenset(("finished", "ft", "completed", "done", "closed"))
+_RACE_NAME = "race"
+# Sort position for results without a provider position (after everyone placed)
+_UNPLACED_POSITION = 999
+
+# Season stages with their results, trimmed to the stage fields the last-race
+# lookup reads. Result rows stay complete: the latest race's rows are formatted.
+_SEASON_STAGES_PARAMS = {
+    "include": "results",
+    "fields[stages]": "id,name,time,track_id,season_id",
+}
+
+# Seconds a /livescores/now response is reused, so the race-status, session-key
+# and telemetry lookups of one polling burst share a single upstream call
+LIVESCORES_TTL_SECONDS = 2.0
+
 
 class RaceService:
     """Service for race data, telemetry, and live race detection."""
@@ -22,37 +46,57 @@ class RaceService:
         self.client = client
         self.season_service = season_service
         self.team_service = team_service
+        # (fetched_at on the monotonic clock, stages); stages is None on error
+        self._livescores_cache: Tuple[float, Optional[List[Dict]]] = (float("-inf"), None)
+        # (fetched_at of the livescores it was derived from, live stage or None)
+        self._current_stage_cache: Tuple[float, Optional[Dict]] = (float("nan"), None)
 
-    def is_race_ongoing(self) -> bool:
+    def _livescores_now(self) -> Optional[List[Dict]]:
         """
-        Check if any race (stage) is currently live.
-
-        Uses GET /livescores/now, which returns live stages with 'time.status'.
+        Live stages from GET /livescores/now, reused for LIVESCORES_TTL_SECONDS.
 
         Returns:
-            True if a race is currently live, False otherwise
+            List of stage objects (a single object is wrapped in a list),
+            or None if the request failed or nothing is live
         """
-        now = datetime.utcnow()
+        return self._livescores_snapshot()[1]
+
+    def _livescores_snapshot(self) -> Tuple[float, Optional[List[Dict]]]:
+        """Like _livescores_now(), but also returns when the stages were fetched."""
+        snapshot = self._livescores_cache
+        now = time.monotonic()
+        if now - snapshot[0] < LIVESCORES_TTL_SECONDS:
+            return snapshot
+
         livescores = self.client.make_request("/livescores/now")
         if not livescores:
-            return False
+            stages = None
+        elif isinstance(livescores, list):
+            stages = livescores
+        else:
+            stages = [livescores]
+        snapshot = (now, stages)
+        self._livescores_cache = snapshot
+        return snapshot
 
-        if not isinstance(livescores, list):
-            livescores = [livescores]
+    def is_race_ongoing(self) -> bool:
+        """
+        Check if any race (stage) is currently live.
 
-        for stage in livescores:
-            if self._is_stage_live(stage, now):
-                return True
+        Uses GET /livescores/now, which returns live stages with 'time.status'.
 
-        return False
+        Returns:
+            True if a race is currently live, False otherwise
+        """
+        return self._get_current_stage() is not None
 
-    def _is_stage_live(self, stage: Dict, now: datetime) -> bool:
+    def _is_stage_live(self, stage: Dict, now_ts: int) -> bool:
         """
         Determine if a stage object from livescores is currently live.
 
         Args:
             stage: Stage object from API
-            now: Current UTC datetime
+            now_ts: Current Unix time in seconds
 
         Returns:
             True if stage is live, False otherwise
@@ -70,11 +114,10 @@ class RaceService:
         ts = starting_at.get("timestamp")
         if ts is not None:
             try:
-                start = datetime.utcfromtimestamp(int(ts))
-                # Races are ~2h; treat 3h as a safe window
-                if 0 <= (now - start).total_seconds() <= 3 * 3600:
+                # Epoch seconds compare directly; no datetime needed
+                if 0 <= now_ts - int(ts) <= LIVE_WINDOW_SECONDS:
                     return True
-            except Exception:
+            except (TypeError, ValueError):
                 pass
 
         return False
@@ -83,22 +126,26 @@ class RaceService:
         """
         Return the current live stage object (if any) from /livescores/now.
 
+        The answer is worked out once per livescores snapshot, so the
+        race-status check and the session-key lookup share it.
+
         Returns:
             Current live stage dict or None if no live stage
         """
-        now = datetime.utcnow()
-        livescores = self.client.make_request("/livescores/now")
-        if not livescores:
-            return None
-
-        if not isinstance(livescores, list):
-            livescores = [livescores]
-
-        for stage in livescores:
-            if self._is_stage_live(stage, now):
-                return stage
+        fetched_at, livescores = self._livescores_snapshot()
+        derived_from, current_stage = self._current_stage_cache
+        if derived_from == fetched_at:
+            return current_stage
+
+        current_stage = None
+        now_ts = int(time.time())
+        for stage in livescores or ():
+            if self._is_stage_live(stage, now_ts):
+                current_stage = stage
+                break
 
-        return None
+        self._current_stage_cache = (fetched_at, current_stage)
+        return current_stage
 
     def get_current_session_key(self) -> Optional[int]:
         """
@@ -130,7 +177,7 @@ class RaceService:
             return None
 
         stages = self.client.make_request(
-            f"/stages/season/{season_id}", params={"include": "results"}
+            f"/stages/season/{season_id}", params=dict(_SEASON_STAGES_PARAMS)
         )
         if not stages:
             return None
@@ -143,23 +190,20 @@ class RaceService:
 
         latest_stage = None
         latest_ts = None
+        now_ts = int(time.time())
 
         for stage in stages:
             if not isinstance(stage, dict):
                 continue
 
-            stage_name = str(stage.get("name", "")).lower()
-
-            # We only care about actual races
-            if stage_name != "race":
+            # We only care about actual races (non-string names never match)
+            stage_name = stage.get("name")
+            if not isinstance(stage_name, str) or stage_name.lower() != _RACE_NAME:
                 continue
 
             time_block = stage.get("time") or {}
-            status_raw = time_block.get("status", "")
-            status = str(status_raw).lower()
-
-            finished_statuses = ["finished", "ft", "completed", "done", "closed"]
-            is_finished = status in finished_statuses
+            status = time_block.get("status")
+            is_finished = isinstance(status, str) and status.lower() in _FINISHED_STATUSES
 
             starting_at = time_block.get("starting_at") or {}
             ts = starting_at.get("timestamp")
@@ -169,8 +213,7 @@ class RaceService:
             if ts is not None:
                 try:
                     ts_int = int(ts)
-                    race_time = datetime.utcfromtimestamp(ts_int)
-                    if (datetime.utcnow() - race_time).total_seconds() > 2 * 3600:
+                    if now_ts - ts_int > RACE_OVER_SECONDS:
                         has_past_timestamp = True
                 except (TypeError, ValueError):
                     pass
@@ -189,8 +232,6 @@ class RaceService:
             if ts_int is None:
                 continue
 
-            print("Stage: ", stage.get('city'), " ts_int: ", ts_int)
-
             if latest_ts is None or ts_int > latest_ts:
                 latest_ts = ts_int
                 latest_stage = stage
@@ -235,22 +276,26 @@ class RaceService:
                 if team_id is not None:
                     unique_team_ids.add(team_id)
 
-        # Fetch team data for all unique team_ids and create mapping
-        team_name_map: Dict[int, str] = {}
-        for team_id in unique_team_ids:
-            team_data = self.team_service.get_team_by_id(team_id)
-            if team_data and isinstance(team_data, dict):
-                team_name = team_data.get("name") or ""
-                team_name_map[team_id] = team_name
+        # Fetch team data for all unique team_ids in one batch and create mapping
+        team_data_map = self.team_service.get_teams_by_ids(unique_team_ids)
+        team_name_map: Dict[int, str] = {
+            team_id: team_data.get("name") or ""
+            for team_id, team_data in team_data_map.items()
+        }
 
-        formatted_results: List[Dict[str, Any]] = []
+        # Formatted rows are split into classified vs DNF/retired as they're built,
+        # each prefixed with its sort key so the sorts below use itemgetter keys
+        classified_keyed: List[Tuple[Any, Dict[str, Any]]] = []
+        dnfs_keyed: List[Tuple[Any, Any, Dict[str, Any]]] = []
 
         for result in results:
             if not isinstance(result, dict):
                 continue
 
+            get = result.get  # bound once; the fields below are read per driver
+
             # Extract driver info from driver.data
-            driver_obj = result.get("driver")
+            driver_obj = get("driver")
             if isinstance(driver_obj, dict) and "data" in driver_obj:
                 driver_obj = driver_obj["data"]
 
@@ -261,24 +306,22 @@ class RaceService:
                     raw_name = raw_name.split("(")[0].strip()
                 driver_name = raw_name
 
-            team_id = result.get("team_id")
-            driver_id = result.get("driver_id")
-            retired = bool(result.get("retired"))
-            laps = result.get("laps")
-            raw_position = result.get("position")
+            team_id = get("team_id")
+            driver_id = get("driver_id")
+            retired = bool(get("retired"))
+            laps = get("laps")
+            raw_position = get("position")
 
             # Get constructor name from team mapping
-            constructor_name = ""
-            if team_id is not None and team_id in team_name_map:
-                constructor_name = team_name_map[team_id]
+            constructor_name = team_name_map.get(team_id, "")
 
             # Extract fastest lap information (check various possible field names)
-            fastest_lap = result.get("fastest_lap", False)
-            has_fastest_lap = result.get("has_fastest_lap", False)
-            fastest_lap_time = result.get("fastest_lap_time")
-            best_lap_time = result.get("best_lap_time")
+            fastest_lap = get("fastest_lap", False)
+            has_fastest_lap = get("has_fastest_lap", False)
+            fastest_lap_time = get("fastest_lap_time")
+            best_lap_time = get("best_lap_time")
 
-            formatted_results.append({
+            row = {
                 # Raw provider-supplied position
                 "position_raw": raw_position,
                 # Final display position (we'll overwrite for classified finishers)
@@ -288,7 +331,7 @@ class RaceService:
                 "constructor_id": str(team_id) if team_id is not None else "",
                 "constructor_name": constructor_name,
                 "points": 0.0,  # Will be calculated by calculate_race_points
-                "time": result.get("driver_time") or result.get("driver_time_int"),
+                "time": get("driver_time") or get("driver_time_int"),
                 "retired": retired,
                 "laps": laps,
                 # Fastest lap indicators (for points calculation)
@@ -296,18 +339,19 @@ class RaceService:
                 "has_fastest_lap": has_fastest_lap or fastest_lap,
                 "fastest_lap_time": fastest_lap_time,
                 "best_lap_time": best_lap_time,
-            })
+            }
 
-        # Split into classified vs DNF/retired
-        classified = [r for r in formatted_results if not r["retired"]]
-        dnfs = [r for r in formatted_results if r["retired"]]
+            sort_pos = raw_position if raw_position is not None else _UNPLACED_POSITION
+            if retired:
+                dnfs_keyed.append((-(laps or 0), sort_pos, row))
+            else:
+                classified_keyed.append((sort_pos, row))
 
         # --- Classified (finishers) ---
+        # Sort by provider raw position (stable, so ties keep API order)
+        classified_keyed.sort(key=itemgetter(0))
+        classified = [row for _, row in classified_keyed]
         if classified:
-            # Sort by provider raw position
-            classified.sort(
-                key=lambda r: r["position_raw"] if r["position_raw"] is not None else 999
-            )
             # Renumber 1..N for clean table
             for idx, r in enumerate(classified, start=1):
                 r["position"] = idx
@@ -320,13 +364,8 @@ class RaceService:
         # Sort DNFs in a sensible way:
         #   - first by laps (desc: those who ran further appear earlier)
         #   - then by raw position as secondary tie-breaker
-        if dnfs:
-            dnfs.sort(
-                key=lambda r: (
-                    -(r["laps"] or 0),
-                    r["position_raw"] if r["position_raw"] is not None else 999
-                )
-            )
+        dnfs_keyed.sort(key=itemgetter(0, 1))
+        dnfs = [row for _, _, row in dnfs_keyed]
 
         # Extract race metadata
         time_block = stage.get("time") or {}
@@ -359,14 +398,11 @@ class RaceService:
         Returns:
             Dict containing stage info + live results, or None if nothing live.
         """
-        now = datetime.utcnow()
-        livescores = self.client.make_request("/livescores/now")
+        now_ts = int(time.time())
+        livescores = self._livescores_now()
         if not livescores:
             return None
 
-        if not isinstance(livescores, list):
-            livescores = [livescores]
-
         chosen_stage: Optional[Dict] = None
         for stage in livescores:
             if not isinstance(stage, dict):
@@ -377,7 +413,7 @@ class RaceService:
                 chosen_stage = stage
                 break
 
-            if session_key is None and self._is_stage_live(stage, now):
+            if session_key is None and self._is_stage_live(stage, now_ts):
                 chosen_stage = stage
                 break
 
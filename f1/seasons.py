@@ -3,6 +3,9 @@ from typing import Optional
 from .client import F1APIClient
 from .cache import Cache
 
+# Year -> season ID mappings never change once a season exists
+SEASON_ID_CACHE_TTL_MINUTES = 24 * 60
+
 
 class SeasonService:
     """Service for managing F1 seasons."""
@@ -22,7 +25,8 @@ class SeasonService:
         """
         Map a year (e.g. 2025) to SportMonks season ID.
 
-        Uses GET /seasons, then matches on 'name' == "2025".
+        Uses GET /seasons, then matches on 'name' == "2025". Every season in
+        the response is cached, not just the one asked for.
 
         Args:
             season_year: Year of the season (e.g., 2025)
@@ -39,13 +43,15 @@ class SeasonService:
         if not seasons:
             return None
 
+        # Index every season in this one response (example: { "id": 10, "name": "2025" })
+        # and cache them all, so lookups for other years don't refetch /seasons
+        by_name = {}
         for season in seasons:
-            # Example: { "id": 10, "name": "2025" }
-            if str(season.get("name")) == str(season_year):
-                season_id = season.get("id")
-                if season_id is not None:
-                    self.cache.set(cache_key, season_id)
-                    return season_id
+            season_id = season.get("id")
+            if season_id is not None:
+                by_name.setdefault(str(season.get("name")), season_id)
 
-        return None
+        for name, season_id in by_name.items():
+            self.cache.set(f"season_id:{name}", season_id, ttl_minutes=SEASON_ID_CACHE_TTL_MINUTES)
 
+        return by_name.get(str(season_year))
@@ -8,21 +8,29 @@ from .races import RaceService
 from .teams import TeamService
 
 
+# The last finished race only changes after a race weekend
+LAST_RACE_CACHE_TTL_MINUTES = 60
+
+
 class F1Service:
     """Service for interacting with SportMonks F1 API."""
 
-    def __init__(self, provider: str = "sportmonks"):
+    def __init__(self, provider: str = "sportmonks", cache_ttl_minutes: int = 10):
         """
         Initialize F1 service with SportMonks provider.
 
+        The service holds the in-memory cache, so create it once per app
+        (see app.extensions['f1_service']) rather than per request.
+
         Args:
             provider: API provider (defaults to 'sportmonks')
+            cache_ttl_minutes: Default TTL for cached API data
         """
         self.provider = provider
         
         # Initialize core components
         self._client = F1APIClient()
-        self._cache = Cache(provider=provider, ttl_minutes=10)
+        self._cache = Cache(provider=provider, ttl_minutes=cache_ttl_minutes)
         self._season_service = SeasonService(self._client, self._cache)
         self._standings_service = StandingsService(
             self._client, self._cache, self._season_service
@@ -104,8 +112,18 @@ class F1Service:
         - Splits results into:
             * results: classified finishers (non-retired), positions 1..N
             * dnf_results: retired / DNF / DSQ entries
+
+        Results are cached per season for LAST_RACE_CACHE_TTL_MINUTES.
         """
-        return self._race_service.get_last_race_results(season_year=season_year)
+        cache_key = f"last_race:{season_year or 'current'}"
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        last_race = self._race_service.get_last_race_results(season_year=season_year)
+        if last_race is not None:
+            self._cache.set(cache_key, last_race, ttl_minutes=LAST_RACE_CACHE_TTL_MINUTES)
+        return last_race
 
     def get_telemetry(self, session_key: Optional[int] = None) -> Optional[Dict]:
         """
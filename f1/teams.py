@@ -1,8 +1,15 @@
 """Team management for F1 API."""
-from typing import Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional
+from flask import current_app
 from .client import F1APIClient
 from .cache import Cache
 
+# SportMonks has no bulk /teams lookup, so cache misses are fetched concurrently.
+# Separate from the route-level pool so a request already running there can't
+# deadlock waiting on its own workers.
+_TEAM_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix='f1-teams')
+
 
 class TeamService:
     """Service for managing F1 teams."""
@@ -50,3 +57,43 @@ class TeamService:
 
         return None
 
+    def get_teams_by_ids(self, team_ids: Iterable[int]) -> Dict[int, Dict]:
+        """
+        Get team data for several team IDs at once.
+
+        Cached teams are returned directly; the misses are fetched from
+        GET /teams/{ID} in parallel (and cached by get_team_by_id), so a race's
+        ~10 teams cost one round-trip of latency instead of ten.
+
+        Args:
+            team_ids: Team IDs (duplicates and None are ignored)
+
+        Returns:
+            Mapping of team_id to team data dict, for the teams that were found
+        """
+        teams: Dict[int, Dict] = {}
+        misses = []
+        for team_id in set(team_ids):
+            if team_id is None:
+                continue
+            cached = self.cache.get(f"team:{team_id}")
+            if cached is not None:
+                teams[team_id] = cached
+            else:
+                misses.append(team_id)
+
+        if not misses:
+            return teams
+
+        # Workers need the app context: the API client reads app config
+        app = current_app._get_current_object()
+
+        def fetch(team_id: int) -> Optional[Dict]:
+            with app.app_context():
+                return self.get_team_by_id(team_id)
+
+        for team_id, team_data in zip(misses, _TEAM_POOL.map(fetch, misses)):
+            if team_data:
+                teams[team_id] = team_data
+
+        return teams
@@ -43,7 +43,7 @@ export interface Event {
   start_at: string | null;
   end_at: string | null;
   status: 'upcoming' | 'live' | 'finished';
-  metadata: Record<string, any> | null;
+  metadata?: Record<string, any> | null; // only with ?include=metadata
 }
 
 export interface Asset {
@@ -1,5 +1,5 @@
 """Pricing module for bonding curve calculations."""
-from .bonding_curve import price, buy_cost, sell_payout, get_current_supply
+from .bonding_curve import price, price_float, prices_float, buy_cost, sell_payout, get_current_supply, to_decimal
 
-__all__ = ['price', 'buy_cost', 'sell_payout', 'get_current_supply']
+__all__ = ['price', 'price_float', 'prices_float', 'buy_cost', 'sell_payout', 'get_current_supply', 'to_decimal']
 
@@ -1,7 +1,21 @@
 """Bonding curve pricing functions for AMM market maker."""
 from decimal import Decimal
 from math import sqrt
-from db import db, Position
+from typing import List, Sequence
+from db import db, Market
+
+
+def to_decimal(value) -> Decimal:
+    """
+    Coerce a numeric column value to Decimal.
+    
+    Numeric columns already load as Decimal, so those pass through untouched
+    instead of being re-parsed via str(); ints and floats (e.g. unflushed
+    defaults) are converted through str() to keep their printed value.
+    """
+    if isinstance(value, Decimal):
+        return value
+    return Decimal(str(value))
 
 
 def price(s: Decimal, a: Decimal, b: Decimal) -> Decimal:
@@ -28,6 +42,46 @@ def price(s: Decimal, a: Decimal, b: Decimal) -> Decimal:
     return a * sqrt_s + b
 
 
+def price_float(s: float, a: float, b: float) -> float:
+    """
+    Current price given supply s, computed with native floats.
+    
+    Same formula as price(), for read paths that only need a float for
+    display and would otherwise round-trip through Decimal.
+    
+    Args:
+        s: Current supply (total shares outstanding)
+        a: Bonding curve parameter (slope)
+        b: Bonding curve baseline (y-intercept)
+    
+    Returns:
+        Current price per share
+    """
+    if s < 0:
+        raise ValueError("Supply cannot be negative")
+    return a * sqrt(s) + b
+
+
+def prices_float(s: Sequence[float], a: Sequence[float], b: Sequence[float]) -> List[float]:
+    """
+    Current prices for a batch of markets, computed with native floats.
+    
+    Element-wise price_float() over parallel sequences, evaluated in a single
+    comprehension so listing endpoints don't pay a function call per row.
+    
+    Args:
+        s: Current supplies
+        a: Bonding curve slopes
+        b: Bonding curve baselines
+    
+    Returns:
+        Current price per share for each market, in input order
+    """
+    if any(si < 0 for si in s):
+        raise ValueError("Supply cannot be negative")
+    return [ai * sqrt(si) + bi for si, ai, bi in zip(s, a, b)]
+
+
 def buy_cost(s: Decimal, delta_s: Decimal, a: Decimal, b: Decimal) -> Decimal:
     """
     Cost to buy delta_s shares from current supply s.
@@ -118,22 +172,18 @@ def get_current_supply(market_id: int) -> Decimal:
     """
     Get current supply (total shares outstanding) for a market.
     
-    Supply is the sum of all Position.shares for the market.
+    Supply is the sum of all Position.shares for the market, maintained on
+    Market.supply by trades and settlement rather than aggregated per call.
     
     Args:
         market_id: Market ID
     
     Returns:
-        Current supply as Decimal (0 if no positions exist)
+        Current supply as Decimal (0 if the market doesn't exist)
     """
-    from sqlalchemy import func
-    
-    result = db.session.query(func.sum(Position.shares)).filter(
-        Position.market_id == market_id
-    ).scalar()
+    result = db.session.query(Market.supply).filter(Market.id == market_id).scalar()
     
     if result is None:
         return Decimal('0')
     
-    return Decimal(str(result))
-
+    return to_decimal(result)
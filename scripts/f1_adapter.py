@@ -83,7 +83,7 @@ class F1Adapter:
             # We'll use metadata_json to store F1 driver_id
             participant = Participant.query.filter(
                 Participant.sport_id == sport.id,
-                Participant.metadata_json['f1_driver_id'].astext == str(driver_id)
+                Participant.metadata_json.contains({'f1_driver_id': driver_id})
             ).first()
             
             if not participant:
@@ -169,7 +169,7 @@ class F1Adapter:
         # Use metadata_json to store F1 stage_id
         event = Event.query.filter(
             Event.season_id == season.id,
-            Event.metadata_json['f1_stage_id'].astext == str(stage_id)
+            Event.metadata_json.contains({'f1_stage_id': stage_id})
         ).first()
         
         if not event:
@@ -2,8 +2,9 @@
 import sys
 from decimal import Decimal
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 from app import app
-from db import db, Event, EventResult, Participant, ResultStatus
+from db import db, Event, EventResult, ResultStatus
 from services.settlement_service import SettlementService
 
 
@@ -28,11 +29,19 @@ def simulate_event(event_id: int):
         # For simplicity, we'll get participants from markets
         from db import Market, Asset
         
-        markets = Market.query.filter_by(event_id=event_id).all()
+        # Asset and participant in the same query, not one lookup per market
+        markets = Market.query.options(
+            joinedload(Market.asset).joinedload(Asset.participant)
+        ).filter_by(event_id=event_id).all()
         if not markets:
             print("Error: No markets found for this event")
             return
         
+        # Results that already exist for this event, in one query
+        existing_participant_ids = {
+            participant_id for (participant_id,) in
+            db.session.query(EventResult.participant_id).filter_by(event_id=event_id)
+        }
         participants_processed = set()
         
         for market in markets:
@@ -44,17 +53,11 @@ def simulate_event(event_id: int):
             if participant_id in participants_processed:
                 continue
             
-            participant = Participant.query.get(participant_id)
+            participant = asset.participant
             if not participant:
                 continue
             
-            # Check if result already exists
-            existing_result = EventResult.query.filter_by(
-                event_id=event_id,
-                participant_id=participant_id
-            ).first()
-            
-            if existing_result:
+            if participant_id in existing_participant_ids:
                 print(f"  Result already exists for {participant.name}, skipping...")
                 continue
             
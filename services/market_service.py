@@ -1,9 +1,9 @@
 """Market service for buying and selling shares."""
 from decimal import Decimal
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from db import db, Market, Position, Trade, PriceHistory, MarketStatus, TransactionType
-from pricing.bonding_curve import buy_cost, sell_payout, get_current_supply, price
+from pricing.bonding_curve import buy_cost, sell_payout, price, to_decimal
 from services.wallet_service import WalletService, InsufficientBalanceError
 from sqlalchemy.exc import IntegrityError
 
@@ -52,26 +52,28 @@ class MarketService:
             if market.status != MarketStatus.OPEN:
                 raise MarketClosedError(f"Market {market_id} is not open (status: {market.status.value})")
             
-            # Get current supply
-            current_supply = get_current_supply(market_id)
+            # Current supply from the market row (maintained by every trade)
+            current_supply = to_decimal(market.supply)
             
             # Compute cost
             cost = buy_cost(
                 current_supply,
                 quantity,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
+                to_decimal(market.a),
+                to_decimal(market.b)
             )
             
-            # Lock balance (uses flush, not commit - part of this transaction)
-            WalletService.lock_balance(user_id, cost)
-            
-            # Get or create position
+            # Get or create position (loaded before any pending changes, so no autoflush)
             position = Position.query.filter_by(
                 user_id=user_id,
                 market_id=market_id
             ).first()
             
+            # Lock balance (uses flush, not commit - part of this transaction);
+            # the wallet is loaded once and reused for the debit below
+            wallet = WalletService.get_or_create_wallet(user_id)
+            WalletService.lock_balance(user_id, cost, wallet=wallet)
+            
             if position is None:
                 # Create new position
                 position = Position(
@@ -84,8 +86,8 @@ class MarketService:
                 db.session.add(position)
             else:
                 # Update existing position (weighted average entry price)
-                old_shares = Decimal(str(position.shares))
-                old_avg_price = Decimal(str(position.avg_entry_price))
+                old_shares = to_decimal(position.shares)
+                old_avg_price = to_decimal(position.avg_entry_price)
                 new_shares = old_shares + quantity
                 
                 # Weighted average: (old_shares * old_avg + cost) / new_shares
@@ -99,7 +101,8 @@ class MarketService:
                 transaction_type=TransactionType.BUY,
                 reference_type="market",
                 reference_id=market_id,
-                description=f"Buy {quantity} shares in market {market_id}"
+                description=f"Buy {quantity} shares in market {market_id}",
+                wallet=wallet
             )
             
             # Create trade record
@@ -117,19 +120,29 @@ class MarketService:
             new_supply = current_supply + quantity
             new_price = price(
                 new_supply,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
+                to_decimal(market.a),
+                to_decimal(market.b)
             )
+            now = datetime.utcnow()
             price_history = PriceHistory(
                 market_id=market_id,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 price=new_price,
                 reason=f"buy_{user_id}"
             )
             db.session.add(price_history)
             
-            # Update market
-            market.updated_at = datetime.utcnow()
+            # Update market (including the denormalized latest price)
+            market.last_price = new_price
+            market.last_price_at = now
+            market.updated_at = now
+            market.supply = Market.supply + quantity  # applied in SQL, not read-modify-write
+            
+            # Flush assigns trade.id; read what the response needs before commit
+            # expires the instances (reading them afterwards would re-SELECT)
+            db.session.flush()
+            trade_id = trade.id
+            position_shares = to_decimal(position.shares)
             
             # Commit entire transaction atomically
             db.session.commit()
@@ -142,8 +155,8 @@ class MarketService:
                 "price_per_share": float(cost / quantity),
                 "new_supply": float(new_supply),
                 "new_price": float(new_price),
-                "position_shares": float(position.shares),
-                "trade_id": trade.id
+                "position_shares": float(position_shares),
+                "trade_id": trade_id
             }
         
         except IntegrityError as e:
@@ -190,25 +203,25 @@ class MarketService:
                 market_id=market_id
             ).first()
             
-            if not position or Decimal(str(position.shares)) < quantity:
+            if not position or to_decimal(position.shares) < quantity:
                 raise InsufficientSharesError(
                     f"Insufficient shares. Available: {position.shares if position else 0}, Required: {quantity}"
                 )
             
-            # Get current supply
-            current_supply = get_current_supply(market_id)
+            # Current supply from the market row (maintained by every trade)
+            current_supply = to_decimal(market.supply)
             
             # Compute payout
             payout = sell_payout(
                 current_supply,
                 quantity,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
+                to_decimal(market.a),
+                to_decimal(market.b)
             )
             
             # Update position
-            old_shares = Decimal(str(position.shares))
-            old_avg_price = Decimal(str(position.avg_entry_price))
+            old_shares = to_decimal(position.shares)
+            old_avg_price = to_decimal(position.avg_entry_price)
             new_shares = old_shares - quantity
             
             # Calculate realized P&L for this sale
@@ -217,7 +230,7 @@ class MarketService:
             realized_pnl_for_sale = (sale_price_per_share - cost_basis) * quantity
             
             position.shares = new_shares
-            position.realized_pnl = Decimal(str(position.realized_pnl)) + realized_pnl_for_sale
+            position.realized_pnl = to_decimal(position.realized_pnl) + realized_pnl_for_sale
             position.last_marked_at = datetime.utcnow()
             
             # If all shares sold, we could delete the position, but we'll keep it for history
@@ -248,19 +261,27 @@ class MarketService:
             new_supply = current_supply - quantity
             new_price = price(
                 new_supply,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
+                to_decimal(market.a),
+                to_decimal(market.b)
             )
+            now = datetime.utcnow()
             price_history = PriceHistory(
                 market_id=market_id,
-                timestamp=datetime.utcnow(),
+                timestamp=now,
                 price=new_price,
                 reason=f"sell_{user_id}"
             )
             db.session.add(price_history)
             
-            # Update market
-            market.updated_at = datetime.utcnow()
+            # Update market (including the denormalized latest price)
+            market.last_price = new_price
+            market.last_price_at = now
+            market.updated_at = now
+            market.supply = Market.supply - quantity  # applied in SQL, not read-modify-write
+            
+            # Flush assigns trade.id; read it before commit expires the instance
+            db.session.flush()
+            trade_id = trade.id
             
             # Commit transaction
             db.session.commit()
@@ -275,7 +296,7 @@ class MarketService:
                 "new_supply": float(new_supply),
                 "new_price": float(new_price),
                 "remaining_shares": float(new_shares),
-                "trade_id": trade.id
+                "trade_id": trade_id
             }
         
         except IntegrityError as e:
@@ -300,11 +321,11 @@ class MarketService:
         if not market:
             return None
         
-        current_supply = get_current_supply(market_id)
+        current_supply = to_decimal(market.supply)
         current_price = price(
             current_supply,
-            Decimal(str(market.a)),
-            Decimal(str(market.b))
+            to_decimal(market.a),
+            to_decimal(market.b)
         )
         
         return {
@@ -321,6 +342,25 @@ class MarketService:
             "updated_at": market.updated_at.isoformat() if market.updated_at else None
         }
     
+    @staticmethod
+    def get_recent_price_history(market_id: int, limit: int = 100) -> List[PriceHistory]:
+        """
+        Get a market's most recent price history entries, newest first.
+        
+        Bounded in SQL and served by ix_price_history_market_ts.
+        
+        Args:
+            market_id: Market ID
+            limit: Maximum number of entries
+        
+        Returns:
+            List of PriceHistory rows
+        """
+        return PriceHistory.query.filter_by(market_id=market_id)\
+            .order_by(PriceHistory.timestamp.desc())\
+            .limit(limit)\
+            .all()
+    
     @staticmethod
     def get_user_position(user_id: int, market_id: int) -> Optional[Dict]:
         """
@@ -344,14 +384,18 @@ class MarketService:
         # Get current market price for unrealized P&L
         market = Market.query.get(market_id)
         if market:
-            current_supply = get_current_supply(market_id)
-            current_price = price(
-                current_supply,
-                Decimal(str(market.a)),
-                Decimal(str(market.b))
-            )
-            shares = Decimal(str(position.shares))
-            avg_entry = Decimal(str(position.avg_entry_price))
+            if market.last_price is not None and market.status != MarketStatus.SETTLED:
+                # Every trade records its resulting price; no supply aggregate needed
+                current_price = to_decimal(market.last_price)
+            else:
+                current_supply = to_decimal(market.supply)
+                current_price = price(
+                    current_supply,
+                    to_decimal(market.a),
+                    to_decimal(market.b)
+                )
+            shares = to_decimal(position.shares)
+            avg_entry = to_decimal(position.avg_entry_price)
             unrealized_pnl = (current_price - avg_entry) * shares
         else:
             current_price = None
@@ -2,11 +2,14 @@
 from decimal import Decimal
 from datetime import datetime
 from typing import Dict, List, Optional
+from sqlalchemy import func, update
+from sqlalchemy.orm import joinedload
 from db import (
     db, Event, Market, MarketSettlement, Position, EventResult, ScoringRule,
     MarketStatus, EventStatus, TransactionType, FormulaType
 )
 from services.wallet_service import WalletService
+from pricing.bonding_curve import to_decimal
 
 
 class SettlementService:
@@ -26,10 +29,10 @@ class SettlementService:
         Returns:
             Payout per share as Decimal
         """
-        primary_score = Decimal(str(event_result.primary_score))
-        max_score = Decimal(str(scoring_rule.max_score))
-        alpha = Decimal(str(scoring_rule.alpha))
-        beta = Decimal(str(scoring_rule.beta))
+        primary_score = to_decimal(event_result.primary_score)
+        max_score = to_decimal(scoring_rule.max_score)
+        alpha = to_decimal(scoring_rule.alpha)
+        beta = to_decimal(scoring_rule.beta)
         
         if max_score == 0:
             raise ValueError("Scoring rule max_score cannot be zero")
@@ -58,6 +61,17 @@ class SettlementService:
         # Ensure payout is non-negative
         return max(payout, Decimal('0'))
     
+    @staticmethod
+    def _market_load_options() -> list:
+        """Eager loads for the market relationships settlement reads (asset, scoring rule)."""
+        return [joinedload(Market.asset), joinedload(Market.scoring_rule)]
+    
+    @staticmethod
+    def _results_by_participant(event_id: int) -> Dict[int, EventResult]:
+        """All EventResults for an event in one query, keyed by participant_id."""
+        results = EventResult.query.filter_by(event_id=event_id).all()
+        return {result.participant_id: result for result in results}
+    
     @staticmethod
     def settle_event(event_id: int, source: str = "event_result") -> Dict:
         """
@@ -78,12 +92,14 @@ class SettlementService:
             Dict with settlement summary
         """
         # Get event
-        event = Event.query.get(event_id)
+        event = db.session.get(Event, event_id)
         if not event:
             raise ValueError(f"Event {event_id} not found")
         
         # Get all markets for this event that are open or closed (not already settled)
-        markets = Market.query.filter_by(event_id=event_id).filter(
+        markets = Market.query.options(
+            *SettlementService._market_load_options()
+        ).filter_by(event_id=event_id).filter(
             Market.status.in_([MarketStatus.OPEN, MarketStatus.CLOSED])
         ).all()
         
@@ -96,7 +112,11 @@ class SettlementService:
                 "message": "No markets to settle"
             }
         
+        results_by_participant = SettlementService._results_by_participant(event_id)
+        settled_at = datetime.utcnow()
+        credits = []
         settlements = []
+        payouts = {}  # market_id -> payout_per_share
         total_positions_settled = 0
         total_payout = Decimal('0')
         
@@ -108,12 +128,9 @@ class SettlementService:
                 if not asset:
                     continue
                 
-                if asset.type.value == "participant" and asset.participant_id:
-                    event_result = EventResult.query.filter_by(
-                        event_id=event_id,
-                        participant_id=asset.participant_id
-                    ).first()
-                elif asset.type.value == "team" and asset.team_id:
+                if asset.asset_type.value == "participant" and asset.participant_id:
+                    event_result = results_by_participant.get(asset.participant_id)
+                elif asset.asset_type.value == "team" and asset.team_id:
                     # For team assets, we might need to aggregate participant results
                     # For now, skip team assets (can be implemented later)
                     continue
@@ -138,60 +155,78 @@ class SettlementService:
                 )
                 
                 # Get current price for settlement_price (before settlement)
-                from pricing.bonding_curve import get_current_supply, price
-                current_supply = get_current_supply(market.id)
+                from pricing.bonding_curve import price
+                current_supply = to_decimal(market.supply)
                 settlement_price = price(
                     current_supply,
-                    Decimal(str(market.a)),
-                    Decimal(str(market.b))
+                    to_decimal(market.a),
+                    to_decimal(market.b)
                 )
                 
                 # Create MarketSettlement record
                 market_settlement = MarketSettlement(
                     market_id=market.id,
-                    settled_at=datetime.utcnow(),
+                    settled_at=settled_at,
                     settlement_price=settlement_price,
                     payout_per_share=payout_per_share,
                     source=source
                 )
                 db.session.add(market_settlement)
                 
-                # Update market status
+                # Update market status; nothing is outstanding once positions close below
                 market.status = MarketStatus.SETTLED
+                market.supply = Decimal('0')
                 
-                # Settle all positions in this market
-                positions = Position.query.filter_by(market_id=market.id).filter(
+                payouts[market.id] = payout_per_share
+                settlements.append({
+                    "market_id": market.id,
+                    "asset_id": asset.id,
+                    "payout_per_share": float(payout_per_share),
+                    "settlement_price": float(settlement_price),
+                    "positions_settled": 0
+                })
+            
+            if payouts:
+                settlements_by_market = {entry["market_id"]: entry for entry in settlements}
+                
+                # Open positions across every settled market in one query:
+                # only (market_id, user_id, shares) is needed
+                positions = db.session.query(
+                    Position.market_id, Position.user_id, Position.shares
+                ).filter(
+                    Position.market_id.in_(payouts),
                     Position.shares > 0
-                ).all()
+                ).order_by(Position.id).all()
                 
-                for position in positions:
-                    shares = Decimal(str(position.shares))
-                    gross_payout = shares * payout_per_share
-                    
-                    # Credit wallet
-                    WalletService.add_ledger_entry(
-                        user_id=position.user_id,
-                        amount=gross_payout,
-                        transaction_type=TransactionType.SETTLEMENT,
-                        reference_type="market",
-                        reference_id=market.id,
-                        description=f"Settlement for {shares} shares in market {market.id}"
-                    )
+                for market_id, user_id, position_shares in positions:
+                    shares = to_decimal(position_shares)
+                    gross_payout = shares * payouts[market_id]
                     
-                    # Update position (close it)
-                    position.shares = Decimal('0')
-                    position.last_marked_at = datetime.utcnow()
+                    # Wallet credit, written in one batch for the whole event below
+                    credits.append({
+                        'user_id': user_id,
+                        'amount': gross_payout,
+                        'transaction_type': TransactionType.SETTLEMENT,
+                        'reference_type': "market",
+                        'reference_id': market_id,
+                        'description': f"Settlement for {shares} shares in market {market_id}",
+                    })
                     
+                    settlements_by_market[market_id]["positions_settled"] += 1
                     total_positions_settled += 1
                     total_payout += gross_payout
                 
-                settlements.append({
-                    "market_id": market.id,
-                    "asset_id": asset.id,
-                    "payout_per_share": float(payout_per_share),
-                    "settlement_price": float(settlement_price),
-                    "positions_settled": len(positions)
-                })
+                # Close every position in one UPDATE
+                db.session.execute(
+                    update(Position).where(
+                        Position.market_id.in_(payouts),
+                        Position.shares > 0
+                    ).values(shares=Decimal('0'), last_marked_at=settled_at),
+                    execution_options={'synchronize_session': False},
+                )
+            
+            # Credit all wallets (one multi-row ledger INSERT)
+            WalletService.add_ledger_entries(credits)
             
             # Update event status
             event.status = EventStatus.FINISHED
@@ -247,14 +282,27 @@ class SettlementService:
         Returns:
             Dict with preview of settlements
         """
-        event = Event.query.get(event_id)
+        event = db.session.get(Event, event_id)
         if not event:
             raise ValueError(f"Event {event_id} not found")
         
-        markets = Market.query.filter_by(event_id=event_id).filter(
+        markets = Market.query.options(
+            *SettlementService._market_load_options()
+        ).filter_by(event_id=event_id).filter(
             Market.status.in_([MarketStatus.OPEN, MarketStatus.CLOSED])
         ).all()
         
+        results_by_participant = SettlementService._results_by_participant(event_id)
+        # (position count, total shares) of open positions per market, in one grouped query
+        open_positions = {
+            market_id: (count, to_decimal(total_shares))
+            for market_id, count, total_shares in db.session.query(
+                Position.market_id, func.count(Position.id), func.sum(Position.shares)
+            ).filter(
+                Position.market_id.in_([market.id for market in markets]),
+                Position.shares > 0
+            ).group_by(Position.market_id)
+        }
         previews = []
         
         for market in markets:
@@ -262,11 +310,8 @@ class SettlementService:
             if not asset:
                 continue
             
-            if asset.type.value == "participant" and asset.participant_id:
-                event_result = EventResult.query.filter_by(
-                    event_id=event_id,
-                    participant_id=asset.participant_id
-                ).first()
+            if asset.asset_type.value == "participant" and asset.participant_id:
+                event_result = results_by_participant.get(asset.participant_id)
             else:
                 continue
             
@@ -284,19 +329,14 @@ class SettlementService:
                 market.scoring_rule
             )
             
-            # Count positions
-            positions = Position.query.filter_by(market_id=market.id).filter(
-                Position.shares > 0
-            ).all()
-            
-            total_shares = sum(Decimal(str(p.shares)) for p in positions)
+            positions_count, total_shares = open_positions.get(market.id, (0, Decimal('0')))
             total_payout = total_shares * payout_per_share
             
             previews.append({
                 "market_id": market.id,
                 "asset_id": asset.id,
                 "payout_per_share": float(payout_per_share),
-                "positions_count": len(positions),
+                "positions_count": positions_count,
                 "total_shares": float(total_shares),
                 "total_payout": float(total_payout)
             })
@@ -1,7 +1,9 @@
 """Wallet and ledger service for managing user balances."""
 from decimal import Decimal
-from typing import Optional
+from typing import Dict, List, Optional
+from sqlalchemy import insert
 from db import db, Wallet, LedgerEntry, User, TransactionType
+from pricing.bonding_curve import to_decimal
 
 
 class InsufficientBalanceError(Exception):
@@ -42,7 +44,7 @@ class WalletService:
             Available balance (total balance - locked balance)
         """
         wallet = WalletService.get_or_create_wallet(user_id)
-        available = Decimal(str(wallet.balance)) - Decimal(str(wallet.locked_balance))
+        available = to_decimal(wallet.balance) - to_decimal(wallet.locked_balance)
         return max(available, Decimal('0'))
     
     @staticmethod
@@ -57,7 +59,7 @@ class WalletService:
             Total balance
         """
         wallet = WalletService.get_or_create_wallet(user_id)
-        return Decimal(str(wallet.balance))
+        return to_decimal(wallet.balance)
     
     @staticmethod
     def get_locked_balance(user_id: int) -> Decimal:
@@ -71,16 +73,17 @@ class WalletService:
             Locked balance
         """
         wallet = WalletService.get_or_create_wallet(user_id)
-        return Decimal(str(wallet.locked_balance))
+        return to_decimal(wallet.locked_balance)
     
     @staticmethod
-    def lock_balance(user_id: int, amount: Decimal) -> bool:
+    def lock_balance(user_id: int, amount: Decimal, wallet: Optional[Wallet] = None) -> bool:
         """
         Lock tokens for a pending transaction.
         
         Args:
             user_id: User ID
             amount: Amount to lock
+            wallet: The user's wallet, if the caller already loaded it
         
         Returns:
             True if successful
@@ -91,15 +94,16 @@ class WalletService:
         if amount <= 0:
             raise ValueError("Amount must be positive")
         
-        wallet = WalletService.get_or_create_wallet(user_id)
-        available = Decimal(str(wallet.balance)) - Decimal(str(wallet.locked_balance))
+        if wallet is None:
+            wallet = WalletService.get_or_create_wallet(user_id)
+        available = to_decimal(wallet.balance) - to_decimal(wallet.locked_balance)
         
         if available < amount:
             raise InsufficientBalanceError(
                 f"Insufficient balance. Available: {available}, Required: {amount}"
             )
         
-        wallet.locked_balance = Decimal(str(wallet.locked_balance)) + amount
+        wallet.locked_balance = to_decimal(wallet.locked_balance) + amount
         db.session.flush()  # Flush changes, caller controls commit
         return True
     
@@ -119,7 +123,7 @@ class WalletService:
             raise ValueError("Amount must be positive")
         
         wallet = WalletService.get_or_create_wallet(user_id)
-        current_locked = Decimal(str(wallet.locked_balance))
+        current_locked = to_decimal(wallet.locked_balance)
         
         if current_locked < amount:
             # Don't raise error, just unlock what's available
@@ -137,7 +141,8 @@ class WalletService:
         transaction_type: TransactionType,
         reference_type: Optional[str] = None,
         reference_id: Optional[int] = None,
-        description: Optional[str] = None
+        description: Optional[str] = None,
+        wallet: Optional[Wallet] = None
     ) -> LedgerEntry:
         """
         Create a ledger entry and update wallet balance atomically.
@@ -151,11 +156,13 @@ class WalletService:
             reference_type: Type of reference (e.g., "market", "event")
             reference_id: ID of reference entity
             description: Optional description
+            wallet: The user's wallet, if the caller already loaded it
         
         Returns:
             Created LedgerEntry instance
         """
-        wallet = WalletService.get_or_create_wallet(user_id)
+        if wallet is None:
+            wallet = WalletService.get_or_create_wallet(user_id)
         
         # Create ledger entry
         ledger_entry = LedgerEntry(
@@ -170,37 +177,96 @@ class WalletService:
         db.session.add(ledger_entry)
         
         # Update wallet balance
+        WalletService._apply_amount(wallet, amount)
+        
+        db.session.flush()  # Flush changes, caller controls commit
+        return ledger_entry
+    
+    @staticmethod
+    def add_ledger_entries(entries: List[Dict]) -> int:
+        """
+        Create many ledger entries and update the wallet balances in one batch.
+        
+        Same semantics as add_ledger_entry() per entry, but wallets are loaded
+        with one query, the entries are written with one multi-row INSERT, and
+        the wallet updates go out in a single flush. Used by settlement, which
+        credits every open position at once.
+        
+        Args:
+            entries: Dicts with user_id, amount, transaction_type and optional
+                reference_type, reference_id, description
+        
+        Returns:
+            Number of ledger entries created
+        """
+        if not entries:
+            return 0
+        
+        user_ids = {entry['user_id'] for entry in entries}
+        wallets = {
+            wallet.user_id: wallet
+            for wallet in Wallet.query.filter(Wallet.user_id.in_(user_ids))
+        }
+        for user_id in user_ids - wallets.keys():
+            wallet = Wallet(user_id=user_id, balance=Decimal('0'), locked_balance=Decimal('0'))
+            db.session.add(wallet)
+            wallets[user_id] = wallet
+        db.session.flush()  # assign ids to any new wallets
+        
+        rows = []
+        for entry in entries:
+            wallet = wallets[entry['user_id']]
+            WalletService._apply_amount(wallet, entry['amount'])
+            rows.append({
+                'user_id': entry['user_id'],
+                'wallet_id': wallet.id,
+                'amount': entry['amount'],
+                'transaction_type': entry['transaction_type'],
+                'reference_type': entry.get('reference_type'),
+                'reference_id': entry.get('reference_id'),
+                'description': entry.get('description'),
+            })
+        
+        db.session.execute(insert(LedgerEntry), rows)
+        db.session.flush()  # Flush changes, caller controls commit
+        return len(rows)
+    
+    @staticmethod
+    def _apply_amount(wallet: Wallet, amount: Decimal) -> None:
+        """Apply a ledger amount to a wallet (credits add; debits deduct and release locked funds)."""
         if amount < 0:
             # This is a debit - always deduct from total balance
             abs_amount = abs(amount)
-            wallet.balance = Decimal(str(wallet.balance)) - abs_amount
+            wallet.balance = to_decimal(wallet.balance) - abs_amount
             
             # Also reduce locked balance if funds were reserved for this transaction
-            current_locked = Decimal(str(wallet.locked_balance))
+            current_locked = to_decimal(wallet.locked_balance)
             if current_locked > 0:
                 unlock_amount = min(current_locked, abs_amount)
                 wallet.locked_balance = current_locked - unlock_amount
         else:
             # This is a credit - increase balance
-            wallet.balance = Decimal(str(wallet.balance)) + amount
-        
-        db.session.flush()  # Flush changes, caller controls commit
-        return ledger_entry
+            wallet.balance = to_decimal(wallet.balance) + amount
     
     @staticmethod
-    def get_ledger_history(user_id: int, limit: int = 100) -> list:
+    def get_ledger_history(
+        user_id: int, limit: int = 100, transaction_type: Optional[TransactionType] = None
+    ) -> list:
         """
         Get ledger history for a user.
         
         Args:
             user_id: User ID
             limit: Maximum number of entries to return
+            transaction_type: Only return entries of this type, if given
         
         Returns:
             List of LedgerEntry instances, ordered by created_at desc
         """
-        return LedgerEntry.query.filter_by(user_id=user_id)\
-            .order_by(LedgerEntry.created_at.desc())\
+        query = LedgerEntry.query.filter_by(user_id=user_id)
+        if transaction_type is not None:
+            query = query.filter_by(transaction_type=transaction_type)
+        return query.order_by(LedgerEntry.created_at.desc())\
             .limit(limit)\
             .all()
 
@@ -29,6 +29,19 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def client(app):
+    """Test client with the auth and settlement routes; OTPs are logged rather than emailed."""
+    from api.settlement_routes import bp as settlement_bp
+    from auth import bp as auth_bp
+
+    app.config['OTP_ALLOWED_EMAILS'] = None
+    app.config['MAILGUN_CONFIGURED'] = False
+    app.register_blueprint(auth_bp, url_prefix='/auth')
+    app.register_blueprint(settlement_bp)
+    return app.test_client()
+
+
 @pytest.fixture(scope='function')
 def db_session(app):
     """Database session for testing."""
@@ -142,7 +155,7 @@ def test_scoring_rule(db_session, test_sport):
 def test_asset(db_session, test_participant):
     """Create a test asset."""
     asset = Asset(
-        type=AssetType.PARTICIPANT,
+        asset_type=AssetType.PARTICIPANT,
         participant_id=test_participant.id,
         symbol='TST',
         display_name='Test Driver'
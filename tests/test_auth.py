@@ -0,0 +1,140 @@
+"""Tests for OTP authentication routes."""
+from unittest.mock import patch
+
+from sqlalchemy import event, func, insert, select
+
+from auth.routes import OTP_MAX_ATTEMPTS, OTP_MAX_REQUESTS
+from db import db, OTP, UserRole
+
+
+def _request_code(client, email, code):
+    with patch('auth.routes.generate_otp', return_value=code):
+        return client.post('/auth/request-otp', json={'email': email})
+
+
+def _active_otps(email):
+    return db.session.scalar(
+        select(func.count()).select_from(OTP).where(OTP.email == email, OTP.used.is_(False))
+    )
+
+
+class TestRequestOtp:
+    """Tests for /auth/request-otp."""
+
+    def test_back_to_back_requests_keep_one_active_code(self, client):
+        """A second code for the same email replaces the first."""
+        for _ in range(2):
+            response = client.post('/auth/request-otp', json={'email': 'racer@example.com'})
+            assert response.status_code == 200
+
+        assert _active_otps('racer@example.com') == 1
+        assert db.session.scalar(select(func.count()).select_from(OTP)) == 2
+
+    def test_concurrent_insert_is_retried(self, client):
+        """A code inserted by a concurrent request between invalidate and insert doesn't cause a 500."""
+        email = 'racer@example.com'
+        fired = []
+
+        # Simulate the other request's INSERT landing after this request's UPDATE
+        @event.listens_for(db.session, 'before_flush')
+        def competing_insert(session, flush_context, instances):
+            if not fired:
+                fired.append(True)
+                session.connection().execute(insert(OTP).values(
+                    email=email, code_hash='competing', expires_at=func.current_timestamp(),
+                    used=False, attempts=0, created_at=func.current_timestamp(),
+                ))
+
+        try:
+            response = client.post('/auth/request-otp', json={'email': email})
+        finally:
+            event.remove(db.session, 'before_flush', competing_insert)
+
+        assert fired
+        assert response.status_code == 200
+        assert _active_otps(email) == 1
+
+    def test_requests_are_throttled_per_email(self, client):
+        """Codes beyond the per-email request limit are refused."""
+        for _ in range(OTP_MAX_REQUESTS):
+            assert client.post('/auth/request-otp', json={'email': 'racer@example.com'}).status_code == 200
+
+        assert client.post('/auth/request-otp', json={'email': 'racer@example.com'}).status_code == 429
+        assert client.post('/auth/request-otp', json={'email': 'other@example.com'}).status_code == 200
+
+
+class TestVerifyOtp:
+    """Tests for /auth/verify-otp brute-force limits."""
+
+    def test_correct_code_logs_in(self, client):
+        _request_code(client, 'racer@example.com', '123456')
+
+        response = client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '123456'})
+
+        assert response.status_code == 200
+        assert response.get_json()['email'] == 'racer@example.com'
+
+    def test_attempt_after_limit_rejected_with_correct_code(self, client):
+        _request_code(client, 'racer@example.com', '123456')
+        for _ in range(OTP_MAX_ATTEMPTS):
+            response = client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '000000'})
+            assert response.status_code == 401
+
+        response = client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '123456'})
+
+        assert response.status_code == 429
+
+    def test_guesses_beyond_limit_rejected_then_correct_code(self, client):
+        """Every guess past the limit is refused, and so is the right code after them."""
+        _request_code(client, 'racer@example.com', '123456')
+        statuses = [
+            client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '000000'}).status_code
+            for _ in range(OTP_MAX_ATTEMPTS + 3)
+        ]
+
+        response = client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '123456'})
+
+        assert statuses == [401] * OTP_MAX_ATTEMPTS + [429] * 3
+        assert response.status_code == 429
+
+    def test_new_code_does_not_reset_limit(self, client):
+        _request_code(client, 'racer@example.com', '111111')
+        for _ in range(OTP_MAX_ATTEMPTS - 1):
+            client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '000000'})
+
+        _request_code(client, 'racer@example.com', '222222')
+        assert client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '000000'}).status_code == 401
+
+        response = client.post('/auth/verify-otp', json={'email': 'racer@example.com', 'otp': '222222'})
+
+        assert response.status_code == 429
+
+
+class TestAdminRequired:
+    """Tests for the admin_required route guard."""
+
+    @staticmethod
+    def _preview(client, event_id, **session_values):
+        with client.session_transaction() as sess:
+            sess.update(session_values)
+        return client.get(f'/api/events/{event_id}/settlement-preview')
+
+    def test_anonymous_rejected(self, client, test_event):
+        assert self._preview(client, test_event.id).status_code == 403
+
+    def test_non_admin_session_rejected(self, client, test_user, test_event):
+        response = self._preview(client, test_event.id, user_id=test_user.id, role=UserRole.PLAYER.value)
+
+        assert response.status_code == 403
+
+    def test_admin_session_allowed(self, client, test_admin, test_event):
+        response = self._preview(client, test_event.id, user_id=test_admin.id, role=UserRole.ADMIN.value)
+
+        assert response.status_code == 200
+
+    def test_session_without_role_falls_back_to_database(self, client, test_admin, test_event):
+        """Sessions from before the role was stored are checked against the user's row."""
+        assert self._preview(client, test_event.id, user_id=test_admin.id).status_code == 200
+
+    def test_session_without_role_rejects_non_admin_row(self, client, test_user, test_event):
+        assert self._preview(client, test_event.id, user_id=test_user.id).status_code == 403
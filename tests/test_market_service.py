@@ -23,6 +23,16 @@ class TestMarketService:
             assert result['cost'] > 0
             assert result['market_id'] == test_market.id
     
+    def test_buy_shares_updates_market_supply(self, app, test_user, test_market, test_wallet):
+        """Test that buying keeps the market's supply rollup in step with positions."""
+        with app.app_context():
+            MarketService.buy_shares(test_user.id, test_market.id, Decimal('10.0'))
+            MarketService.buy_shares(test_user.id, test_market.id, Decimal('2.5'))
+
+            market = db.session.get(Market, test_market.id)
+            assert Decimal(str(market.supply)) == Decimal('12.5')
+            assert market.last_price is not None
+
     def test_buy_shares_insufficient_balance(self, app, test_user, test_market):
         """Test buy shares with insufficient balance."""
         with app.app_context():
@@ -1,7 +1,7 @@
 """Tests for bonding curve pricing functions."""
 import pytest
 from decimal import Decimal
-from pricing.bonding_curve import price, buy_cost, sell_payout
+from pricing.bonding_curve import price, price_float, prices_float, buy_cost, sell_payout, to_decimal
 
 
 class TestPrice:
@@ -39,6 +39,60 @@ class TestPrice:
         assert abs(result - Decimal('3')) < Decimal('0.0001')
 
 
+class TestPriceFloat:
+    """Tests for price_float() function."""
+    
+    def test_price_float_at_zero_supply(self):
+        """Price at zero supply should equal baseline b."""
+        assert price_float(0.0, 1.0, 0.5) == 0.5
+    
+    def test_price_float_matches_decimal_price(self):
+        """Float path should agree with the Decimal price()."""
+        for s in ('0', '1', '4', '10', '123.456'):
+            expected = float(price(Decimal(s), Decimal('1.5'), Decimal('0.25')))
+            assert price_float(float(s), 1.5, 0.25) == pytest.approx(expected)
+    
+    def test_price_float_negative_supply_raises_error(self):
+        """Price with negative supply should raise ValueError."""
+        with pytest.raises(ValueError, match="Supply cannot be negative"):
+            price_float(-1.0, 1.0, 0.0)
+
+
+class TestPricesFloat:
+    """Tests for prices_float() function."""
+    
+    def test_prices_float_matches_price_float(self):
+        """Batch prices should match price_float() element-wise."""
+        supplies = [0.0, 1.0, 4.0, 123.456]
+        a = [1.0, 1.5, 2.0, 0.1]
+        b = [0.5, 0.25, 0.0, 1.0]
+        expected = [price_float(s, ai, bi) for s, ai, bi in zip(supplies, a, b)]
+        assert prices_float(supplies, a, b) == expected
+    
+    def test_prices_float_empty(self):
+        """Empty batch returns an empty list."""
+        assert prices_float([], [], []) == []
+    
+    def test_prices_float_negative_supply_raises_error(self):
+        """Any negative supply should raise ValueError."""
+        with pytest.raises(ValueError, match="Supply cannot be negative"):
+            prices_float([1.0, -1.0], [1.0, 1.0], [0.0, 0.0])
+
+
+class TestToDecimal:
+    """Tests for to_decimal() function."""
+    
+    def test_to_decimal_passes_decimal_through(self):
+        """Decimal values are returned as-is."""
+        value = Decimal('1.23456789')
+        assert to_decimal(value) is value
+    
+    def test_to_decimal_converts_int_and_float(self):
+        """Ints and floats convert via their printed value."""
+        assert to_decimal(0) == Decimal('0')
+        assert to_decimal(0.1) == Decimal('0.1')
+
+
 class TestBuyCost:
     """Tests for buy_cost() function."""
     
@@ -5,6 +5,7 @@ from datetime import datetime
 from db import db
 from services.settlement_service import SettlementService
 from services.market_service import MarketService
+from services.wallet_service import WalletService
 from db import (
     EventResult, ResultStatus, EventStatus, MarketStatus, TransactionType
 )
@@ -108,7 +109,7 @@ class TestSettlementService:
             # Create second market
             from db import Market, Asset, AssetType
             asset2 = Asset(
-                type=AssetType.PARTICIPANT,
+                asset_type=AssetType.PARTICIPANT,
                 participant_id=test_participant.id,
                 symbol='TST2',
                 display_name='Test Driver 2'
@@ -149,6 +150,67 @@ class TestSettlementService:
             assert result['markets_settled'] == 2
             assert result['positions_settled'] == 2
     
+    def test_settle_event_pays_each_user_across_markets(self, app, test_user, test_event, test_market, test_participant, test_scoring_rule, test_sport):
+        """Settlement credits every holder per market, closes positions and zeroes supply."""
+        with app.app_context():
+            from db import Asset, AssetType, LedgerEntry, Market, Participant, Position, User, UserRole
+            
+            participant2 = Participant(sport_id=test_sport.id, name='Second Driver', short_code='SEC')
+            db.session.add(participant2)
+            db.session.flush()
+            asset2 = Asset(
+                asset_type=AssetType.PARTICIPANT,
+                participant_id=participant2.id,
+                symbol='SEC',
+                display_name='Second Driver'
+            )
+            db.session.add(asset2)
+            db.session.flush()
+            market2 = Market(
+                event_id=test_event.id,
+                asset_id=asset2.id,
+                scoring_rule_id=test_scoring_rule.id,
+                market_type='outright',
+                status=MarketStatus.OPEN,
+                a=Decimal('1.0'),
+                b=Decimal('0.5')
+            )
+            user2 = User(email='second@example.com', username='second', role=UserRole.PLAYER.value)
+            db.session.add_all([market2, user2])
+            db.session.flush()
+            
+            # Positions written directly: 16 shares outstanding in market 1, 4 in market 2
+            db.session.add_all([
+                Position(user_id=test_user.id, market_id=test_market.id, shares=Decimal('10')),
+                Position(user_id=test_user.id, market_id=market2.id, shares=Decimal('4')),
+                Position(user_id=user2.id, market_id=test_market.id, shares=Decimal('6')),
+            ])
+            test_market.supply = Decimal('16')
+            market2.supply = Decimal('4')
+            
+            # Full score pays 1.0 per share, half score pays 0.5
+            db.session.add_all([
+                EventResult(event_id=test_event.id, participant_id=test_participant.id,
+                            primary_score=Decimal('25'), rank=1, status=ResultStatus.FINISHED),
+                EventResult(event_id=test_event.id, participant_id=participant2.id,
+                            primary_score=Decimal('12.5'), rank=2, status=ResultStatus.FINISHED),
+            ])
+            db.session.commit()
+            WalletService.get_or_create_wallet(test_user.id)
+            WalletService.get_or_create_wallet(user2.id)
+            
+            result = SettlementService.settle_event(test_event.id)
+            
+            assert result['markets_settled'] == 2
+            assert result['positions_settled'] == 3
+            assert WalletService.get_balance(test_user.id) == Decimal('12')
+            assert WalletService.get_balance(user2.id) == Decimal('6')
+            assert LedgerEntry.query.filter_by(transaction_type=TransactionType.SETTLEMENT).count() == 3
+            assert all(position.shares == 0 for position in Position.query.all())
+            for market in Market.query.all():
+                assert market.status == MarketStatus.SETTLED
+                assert market.supply == 0
+    
     def test_preview_settlement(self, app, test_event, test_market, test_participant, test_asset, test_scoring_rule):
         """Test settlement preview."""
         with app.app_context():